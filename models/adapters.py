@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import List, Type
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing_extensions import Annotated
+
+
+@lru_cache(maxsize=None)
+def field_adapter(model: Type[BaseModel], field: str) -> TypeAdapter:
+    """
+    Validator for a single field of `model`, with its constraints but none of
+    the other fields.
+    """
+    info = model.model_fields[field]
+    annotation = info.annotation
+    if info.metadata:
+        annotation = Annotated[(annotation, *info.metadata)]
+    return TypeAdapter(annotation, config=ConfigDict(regex_engine="python-re"))
+
+
+@lru_cache(maxsize=None)
+def list_adapter(entry: Type[BaseModel]) -> TypeAdapter:
+    """
+    Validator of a JSON list of `entry` objects, built once per class.
+    """
+    return TypeAdapter(List[entry])
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, List, Type, Union
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from typing_extensions import Annotated
+
+from models.ietf_interface import Model
+from models.scanning import (
+    INTERFACE,
+    error_details,
+    field_position,
+    find_arrays,
+    model_field,
+    relocate,
+    serial_order,
+)
+
+CHUNK = 256
+"""
+Entries validated per step; a step stops at its first invalid entry.
+"""
+
+
+@lru_cache(maxsize=None)
+def _fail_fast(entry: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(Annotated[List[entry], Field(fail_fast=True)])
+
+
+def validate_json(data: Union[str, bytes], max_errors: int = 1) -> Model:
+    """
+    `Model.model_validate_json(data)` that gives up after `max_errors`
+    errors, 1 (fail fast) by default.
+
+    The interface lists are located at the byte level (see
+    `models.parallel`) and validated a few entries at a time; once
+    `max_errors` errors are collected the remaining entries are not
+    validated at all. The errors raised are the first `max_errors` that
+    serial validation would report, with the same alias locations, e.g.
+    `ietf-interfaces:interfaces-state.ietf-interfaces:interface.3.ietf-ip:ipv6
+    .ietf-ip:address.0.ietf-ip:ip`. Valid documents give the same result as
+    serial validation.
+    """
+    if max_errors < 1:
+        raise ValueError("max_errors must be at least 1")
+    document = data.encode() if isinstance(data, str) else data
+    arrays = find_arrays(document)
+    if not arrays:
+        try:
+            return Model.model_validate_json(data)
+        except ValidationError as error:
+            _raise([error_details(e, e["loc"]) for e in error.errors()], max_errors)
+
+    skeleton, position = [], 0
+    for array in arrays:
+        skeleton.append(document[position : array.opening + 1])
+        position = array.closing
+    skeleton.append(document[position:])
+
+    skeleton_errors: List[Dict[str, Any]] = []
+    try:
+        model = Model.model_validate_json(b"".join(skeleton))
+    except ValidationError as error:
+        skeleton_errors.extend(error_details(e, e["loc"]) for e in error.errors())
+    errors: List[Dict[str, Any]] = []
+    lists: Dict[str, List[BaseModel]] = {}
+    prefix = INTERFACE.strip(b'"').decode()
+    for array in arrays:
+        entries = lists[array.container] = []
+        # Skeleton errors in earlier containers are reported before this list's.
+        position = field_position((array.container,))
+        ahead = sum(1 for e in skeleton_errors if field_position(e["loc"]) < position)
+        first = 0
+        while first < len(array.starts) and ahead + len(errors) < max_errors:
+            last = min(first + CHUNK, len(array.starts)) - 1
+            chunk = b"".join(
+                (b"[", document[array.starts[first] : array.ends[last]], b"]")
+            )
+            try:
+                validated = _fail_fast(array.entry).validate_json(chunk)
+            except ValidationError as error:
+                chunk_errors = error.errors()
+                if chunk_errors[0]["type"] == "json_invalid":
+                    # Offsets in the message would be relative to the chunk.
+                    return Model.model_validate_json(data)
+                errors.extend(
+                    relocate(e, (array.container, prefix), first) for e in chunk_errors
+                )
+                first += chunk_errors[0]["loc"][0] + 1
+                continue
+            if not errors:
+                entries.extend(validated)
+            first = last + 1
+    errors = serial_order(skeleton_errors + errors)
+    if any(e["type"] == "json_invalid" for e in errors):
+        return Model.model_validate_json(data)
+    if errors:
+        _raise(errors, max_errors)
+
+    for array in arrays:
+        container = getattr(model, model_field(array.container))
+        # Validated already, as entries of an identical list.
+        container.__dict__["interface"] = lists[array.container]
+    return model
+
+
+def _raise(errors: List[Dict[str, Any]], max_errors: int) -> None:
+    raise ValidationError.from_exception_data(
+        Model.__name__, errors[:max_errors], input_type="json"
+    )
+
+
+if __name__ == "__main__":
+    import copy
+    import gc
+    import json
+    import random
+    import time
+
+    from models import synthetic
+
+    n, neighbors = 20_000, 4
+    clean = synthetic.payload(n, neighbors)
+    rng = random.Random(0)
+
+    def corrupt(positions: List[int]) -> bytes:
+        document = copy.deepcopy(clean)
+        entries = document["ietf-interfaces:interfaces-state"][
+            "ietf-interfaces:interface"
+        ]
+        for position in positions:
+            entries[position]["ietf-interfaces:if-index"] = 0
+            address = entries[position]["ietf-ip:ipv6"]["ietf-ip:address"][0]
+            address["ietf-ip:ip"] = "not-an-address"
+        return json.dumps(document).encode()
+
+    corpora = {
+        "valid": json.dumps(clean).encode(),
+        "every entry invalid": corrupt(list(range(n))),
+        "1% of entries invalid": corrupt(rng.sample(range(n), n // 100)),
+        "last entry invalid": corrupt([n - 1]),
+    }
+
+    def timed(function: Any, *args: Any) -> Any:
+        gc.collect()
+        start = time.perf_counter()
+        try:
+            function(*args)
+            errors = 0
+        except ValidationError as error:
+            errors = error.error_count()
+        return time.perf_counter() - start, errors
+
+    print(f"{n:,} interfaces x {neighbors} neighbors")
+    for label, data in corpora.items():
+        results = [("serial", *timed(Model.model_validate_json, data))]
+        for limit in (1, 100):
+            results.append((f"max_errors={limit}", *timed(validate_json, data, limit)))
+        print(
+            f"{label:<24}"
+            + "".join(
+                f"  {name} {elapsed:6.2f} s ({errors:,} errors)"
+                for name, elapsed, errors in results
+            )
+        )
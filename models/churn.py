@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, NamedTuple, Tuple, Union
+
+import numpy as np
+
+from models.ietf_interface import InterfacesStateContainer, Model
+from models.neighbors import NeighborTable
+
+State = Union[Model, InterfacesStateContainer]
+
+
+class NeighborKey(NamedTuple):
+    interface: str
+    ip: str
+
+
+class Delta(NamedTuple):
+    """
+    Neighbors only in the new snapshot, only in the old one, and in both
+    with a different `link-layer-address` or `state`.
+    """
+
+    added: List[NeighborKey]
+    removed: List[NeighborKey]
+    changed: List[NeighborKey]
+
+
+class TableDelta(NamedTuple):
+    """
+    `Delta` of two `NeighborTable`s as positions: `added` and `changed` into
+    the new table, `removed` into the old one.
+    """
+
+    added: np.ndarray
+    removed: np.ndarray
+    changed: np.ndarray
+
+
+def delta(old: State, new: State) -> Delta:
+    """
+    Changes to the ARP and neighbor caches (`ipv4`/`ipv6` `neighbor` lists
+    of `interfaces-state`) between two snapshots, keyed by interface name and
+    neighbor `ip`.
+
+    Each interface's caches are reduced to `{ip: (link-layer-address,
+    state)}` and compared as dicts, so an interface whose caches did not
+    change costs one dict comparison; the key sets of the others are
+    differenced. Lists shared between the snapshots are skipped.
+    """
+    old_caches, new_caches = _caches(old), _caches(new)
+    added: List[NeighborKey] = []
+    removed: List[NeighborKey] = []
+    changed: List[NeighborKey] = []
+    for name, new_lists in new_caches.items():
+        old_lists = old_caches.get(name, ())
+        if len(old_lists) == len(new_lists) and all(
+            a is b for a, b in zip(old_lists, new_lists)
+        ):
+            continue
+        before, after = _neighbors(old_lists), _neighbors(new_lists)
+        if before == after:
+            continue
+        added.extend(NeighborKey(name, ip) for ip in after.keys() - before.keys())
+        removed.extend(NeighborKey(name, ip) for ip in before.keys() - after.keys())
+        changed.extend(
+            NeighborKey(name, ip)
+            for ip in after.keys() & before.keys()
+            if after[ip] != before[ip]
+        )
+    for name, old_lists in old_caches.items():
+        if name not in new_caches:
+            removed.extend(NeighborKey(name, ip) for ip in _neighbors(old_lists))
+    return Delta(added, removed, changed)
+
+
+def table_delta(old: NeighborTable, new: NeighborTable) -> TableDelta:
+    """
+    `delta()` of one neighbor list held as two `NeighborTable`s, with sorted
+    arrays: the 128-bit address columns are intersected and the MAC and
+    state columns of the common entries compared, all in numpy.
+    """
+    if old.text_ips or new.text_ips:
+        # Addresses kept as text have no usable packed form.
+        return _text_delta(old, new)
+    old_keys, new_keys = old.keys(), new.keys()
+    _, old_common, new_common = np.intersect1d(
+        old_keys, new_keys, assume_unique=True, return_indices=True
+    )
+    kept = np.zeros(len(old), bool)
+    kept[old_common] = True
+    present = np.zeros(len(new), bool)
+    present[new_common] = True
+    differs = (
+        old.link_layer_address[old_common] != new.link_layer_address[new_common]
+    ).any(axis=1) | (old.state[old_common] != new.state[new_common])
+    old_macs, new_macs = old.text_macs, new.text_macs
+    if old_macs or new_macs:
+        for k, (i, j) in enumerate(zip(old_common.tolist(), new_common.tolist())):
+            if i in old_macs or j in new_macs:
+                differs[k] = old[i].link_layer_address != new[j].link_layer_address
+    return TableDelta(
+        np.flatnonzero(~present),
+        np.flatnonzero(~kept),
+        np.sort(new_common[differs]),
+    )
+
+
+def _text_delta(old: NeighborTable, new: NeighborTable) -> TableDelta:
+    def positions(table: NeighborTable) -> Dict[str, int]:
+        return {view.ip: view.position for view in table}
+
+    def value(table: NeighborTable, position: int) -> Tuple[Any, int]:
+        return table[position].link_layer_address, int(table.state[position])
+
+    before, after = positions(old), positions(new)
+    changed = [
+        after[ip]
+        for ip in after.keys() & before.keys()
+        if value(old, before[ip]) != value(new, after[ip])
+    ]
+    return TableDelta(
+        np.array(sorted(after[ip] for ip in after.keys() - before.keys()), np.intp),
+        np.array(sorted(before[ip] for ip in before.keys() - after.keys()), np.intp),
+        np.array(sorted(changed), np.intp),
+    )
+
+
+def _caches(state: State) -> Dict[str, Tuple[Any, ...]]:
+    """
+    Interface name -> its ARP and neighbor cache lists.
+    """
+    if isinstance(state, Model):
+        state = state.interfaces_state or InterfacesStateContainer()
+    caches = {}
+    for entry in state.interface or ():
+        caches[entry.name] = tuple(
+            family.neighbor
+            for family in (entry.ipv4, entry.ipv6)
+            if family is not None and family.neighbor
+        )
+    return caches
+
+
+def _neighbors(lists: Tuple[Any, ...]) -> Dict[str, Tuple[Any, Any]]:
+    return {
+        neighbor.ip: (neighbor.link_layer_address, getattr(neighbor, "state", None))
+        for neighbor in (neighbor for neighbors in lists for neighbor in neighbors)
+    }
+
+
+if __name__ == "__main__":
+    import copy
+    import gc
+    import itertools
+    import random
+    import socket
+    import time
+
+    from models import synthetic
+
+    n, neighbors = 5_000, 40
+    payload = synthetic.state_payload(n, neighbors)
+    addresses = (
+        socket.inet_ntop(socket.AF_INET6, (0xFE80 << 112 | i).to_bytes(16, "big"))
+        for i in itertools.count(1)
+    )
+    for entry in payload["ietf-interfaces:interface"]:
+        # RFC 5952 text, as devices report it, and unique across interfaces.
+        for neighbor in entry["ietf-ip:ipv6"]["ietf-ip:neighbor"]:
+            neighbor["ietf-ip:ip"] = next(addresses)
+    rng = random.Random(0)
+    polled = copy.deepcopy(payload)
+    for entry in polled["ietf-interfaces:interface"]:
+        cache = entry["ietf-ip:ipv6"]["ietf-ip:neighbor"]
+        for neighbor in cache:
+            if rng.random() < 0.01:
+                neighbor["ietf-ip:state"] = "stale"
+        if rng.random() < 0.2:
+            cache.pop(rng.randrange(len(cache)))
+        if rng.random() < 0.2:
+            cache.append(dict(cache[0], **{"ietf-ip:ip": next(addresses)}))
+    old = InterfacesStateContainer.model_validate(payload)
+    new = InterfacesStateContainer.model_validate(polled)
+    print(f"{n:,} interfaces x {neighbors} neighbors, two independently parsed polls")
+
+    def timed(label: str, function: Any, *args: Any) -> Any:
+        gc.collect()
+        start = time.perf_counter()
+        result = function(*args)
+        print(f"{label:<40} {(time.perf_counter() - start) * 1000:7.1f} ms")
+        return result
+
+    def naive(old: State, new: State) -> Tuple[set, set, set]:
+        def table(state: State) -> Dict[Tuple[str, str], Any]:
+            return {
+                (entry.name, neighbor.ip): neighbor.model_dump(
+                    include={"link_layer_address", "state"}
+                )
+                for entry in state.interface
+                for neighbor in entry.ipv6.neighbor
+            }
+
+        before, after = table(old), table(new)
+        return (
+            after.keys() - before.keys(),
+            before.keys() - after.keys(),
+            {key for key in after.keys() & before.keys() if after[key] != before[key]},
+        )
+
+    expected = timed("model_dump per neighbor and compare", naive, old, new)
+    result = timed("delta()", delta, old, new)
+    assert tuple(set(keys) for keys in result) == expected
+    print(
+        f"{'':<40} {len(result.added):,} added, {len(result.removed):,} removed, "
+        f"{len(result.changed):,} changed"
+    )
+    timed("delta() against itself", delta, new, new)
+
+    def flat(state: InterfacesStateContainer) -> List[Any]:
+        return [
+            neighbor for entry in state.interface for neighbor in entry.ipv6.neighbor
+        ]
+
+    tables = (
+        NeighborTable.from_entries(flat(old)),
+        NeighborTable.from_entries(flat(new)),
+    )
+    positions = timed(
+        f"table_delta() of {len(tables[1]):,}-entry tables", table_delta, *tables
+    )
+    assert [len(p) for p in positions] == [len(keys) for keys in result]
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import copy
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import (
+    BaseModel,
+    GetCoreSchemaHandler,
+    GetJsonSchemaHandler,
+    create_model,
+)
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema
+from typing_extensions import Self
+
+
+class EnumValue(str):
+    """
+    Value of a YANG enumeration leaf in compact models: the plain string,
+    plus the `name`, `value` and `member` of the corresponding generated
+    `Enum` member and its `code`, the member's position as a small integer
+    for columnar encodings.
+
+    There is one instance per member, created up front, so validating a leaf
+    is a lookup and serializing it is serializing a `str`. Instances compare
+    equal to both their string and their `Enum` member, so code written for
+    the enum models keeps working; `is` and `isinstance` checks against the
+    `Enum` do not. Like the members of a `str` mixin `Enum`, they hash as
+    the member: mappings keyed by members find them, mappings keyed by
+    values only where the member's name and value agree (`up`, but not
+    `lower-layer-down`), so key lookup tables by both, as `models.arrow`
+    does.
+    """
+
+    enum: Type[Enum]
+    lookup: Dict[Any, EnumValue]
+    """
+    String values and `Enum` members -> instance.
+    """
+    members: Tuple[EnumValue, ...]
+    """
+    Instances in code order.
+    """
+
+    name: str
+    value: str
+    code: int
+    member: Enum
+
+    def __new__(cls, value: Any) -> Self:
+        # Like `Enum(value)`: the existing instance for a value or member.
+        try:
+            return cls.lookup[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"{value!r} is not a valid {cls.__name__}") from None
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Enum):
+            return other is self.member
+        return str.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash(self.member)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}.{self.name}: {self.value!r}>"
+
+    def __reduce__(self) -> Any:
+        return type(self), (self.value,)
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        # Values are looked up in Rust, with the same errors as the generated
+        # `Enum` leaves; anything else goes through `__new__`.
+        return core_schema.enum_schema(
+            cls,
+            list(cls.members),
+            sub_type="str",
+            serialization=core_schema.simple_ser_schema("str"),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(
+        cls, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        return {"enum": [member.value for member in cls.members], "type": "string"}
+
+
+@lru_cache(maxsize=None)
+def string_enum(enum: Type[Enum]) -> Type[EnumValue]:
+    """
+    The compact counterpart of a generated `Enum`, with its instances as
+    class attributes under the member names, e.g.
+    `string_enum(EnumerationEnum9).up`. Calling it maps values and members
+    to instances, like calling the `Enum`.
+    """
+    cls = type(enum.__name__, (EnumValue,), {"__module__": __name__})
+    cls.enum = enum
+    cls.lookup = {}
+    members = []
+    for code, member in enumerate(enum):
+        value = str.__new__(cls, member.value)
+        value.name, value.value, value.code = member.name, member.value, code
+        value.member = member
+        setattr(cls, member.name, value)
+        cls.lookup[member.value] = cls.lookup[member] = value
+        members.append(value)
+    cls.members = tuple(members)
+    return cls
+
+
+def compact(cls: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Variant of a generated model class, and of every class nested in it, in
+    which enumeration leaves hold `EnumValue` strings instead of `Enum`
+    members, e.g. `compact(Model).model_validate_json(data)`.
+
+    Aliases, constraints and configuration are unchanged; instances
+    serialize to the same JSON. Classes are cached, so `compact(cls)` always
+    returns the same class.
+    """
+    return _compact(cls)
+
+
+@lru_cache(maxsize=None)
+def _compact(cls: Type[BaseModel]) -> Type[BaseModel]:
+    definitions = {}
+    for attr, info in cls.model_fields.items():
+        annotation = _annotation(info.annotation)
+        info = copy.copy(info)
+        info.annotation = annotation
+        definitions[attr] = (annotation, info)
+    return create_model(
+        f"{cls.__name__}Compact",
+        __config__=cls.model_config,
+        __doc__=cls.__doc__,
+        __module__=__name__,
+        **definitions,
+    )
+
+
+def _annotation(annotation: Any) -> Any:
+    if isinstance(annotation, type):
+        if issubclass(annotation, Enum):
+            return string_enum(annotation)
+        return _compact(annotation) if _is_model(annotation) else annotation
+    arguments = get_args(annotation)
+    if get_origin(annotation) is list:
+        return List[_annotation(arguments[0])]
+    if get_origin(annotation) is Union:
+        return Union[tuple(_annotation(argument) for argument in arguments)]
+    return annotation
+
+
+def __getattr__(name: str) -> Any:
+    # Lets pickle find the derived classes by name, in any process.
+    from models import ietf_interface
+
+    generated = getattr(ietf_interface, name.removesuffix("Compact"), None)
+    if name.endswith("Compact") and _is_model(generated):
+        return _compact(generated)
+    if isinstance(generated, type) and issubclass(generated, Enum):
+        return string_enum(generated)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+if __name__ == "__main__":
+    import gc
+    import json
+    import pickle
+    import time
+
+    from models import synthetic
+    from models.arrow import record_batches
+    from models.ietf_interface import Ipv6Container2, Model
+
+    n, neighbors = 2_000, 100
+    state = synthetic.state_payload(n, neighbors)["ietf-interfaces:interface"]
+    containers = [
+        json.dumps(entry["ietf-ip:ipv6"]).encode() for entry in state if entry
+    ]
+    print(f"{n:,} Ipv6Container2 payloads x {neighbors} neighbors")
+
+    def timed(function: Any, items: List[Any]) -> Tuple[float, List[Any]]:
+        gc.collect()
+        start = time.perf_counter()
+        results = [function(item) for item in items]
+        return time.perf_counter() - start, results
+
+    results = {}
+    for label, cls in (("enum", Ipv6Container2), ("compact", compact(Ipv6Container2))):
+        validated, models = timed(cls.model_validate_json, containers)
+        dumped, documents = timed(
+            lambda m: m.model_dump_json(by_alias=True, exclude_none=True), models
+        )
+        python, _ = timed(lambda m: m.model_dump(by_alias=True), models)
+        pickled, _ = timed(pickle.dumps, models)
+        results[label] = documents
+        print(
+            f"{label:<8} validate_json {validated:6.2f} s  dump_json {dumped:6.2f} s  "
+            f"model_dump {python:6.2f} s  pickle {pickled:6.2f} s"
+        )
+        del models
+    assert results["enum"] == results["compact"]
+
+    document = synthetic.payload(n // 4, neighbors // 4)
+    for label, cls in (("enum", Model), ("compact", compact(Model))):
+        model = cls.model_validate(document)
+        gc.collect()
+        start = time.perf_counter()
+        list(record_batches(model.interfaces_state))
+        print(f"{label:<8} Arrow batches {time.perf_counter() - start:6.2f} s")
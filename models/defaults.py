@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from typing import Any, List, NoReturn
+
+from pydantic import BaseModel, GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+from models import ietf_interface
+
+
+class _EmptyList(list):
+    """
+    An empty list that cannot be changed in place, so one instance can be
+    the default of every `[]` leaf-list.
+    """
+
+    def __hash__(self) -> int:
+        # pydantic copies unhashable defaults for every instance.
+        return 0
+
+    def _shared(self, *args: Any) -> NoReturn:
+        raise TypeError("shared default leaf-list; assign a new list instead")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _shared
+    __setitem__ = __delitem__ = _shared
+
+    def __iadd__(self, other: Any) -> List[Any]:
+        # `entry.lower_layer_if += [...]` assigns a new list.
+        return list(other)
+
+    def __imul__(self, other: Any) -> List[Any]:
+        return []
+
+    def __copy__(self) -> _EmptyList:
+        return self
+
+    def __deepcopy__(self, memo: Any) -> _EmptyList:
+        return self
+
+    def __reduce__(self) -> str:
+        return "EMPTY"
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        # JSON schemas encode defaults through their type: `"default": []`.
+        return core_schema.list_schema()
+
+
+EMPTY = _EmptyList()
+
+
+def share_defaults() -> None:
+    """
+    Make every `[]` default of the generated models (`higher-layer-if` and
+    `lower-layer-if`) the shared, immutable `EMPTY` list and rebuild the
+    validators.
+
+    pydantic deep-copies mutable defaults into every instance it validates,
+    which costs more than validating the rest of a mostly-default interface.
+    `EMPTY` compares equal to `[]`, so serialization with
+    `exclude_defaults=True` and equality are unchanged; in-place changes to a
+    defaulted leaf-list raise `TypeError`, assign a new list instead.
+
+    Affects instances validated afterwards, including through classes derived
+    afterwards such as `models.compact.compact(cls)`. Idempotent.
+    """
+    models = [
+        value
+        for value in vars(ietf_interface).values()
+        if isinstance(value, type)
+        and issubclass(value, BaseModel)
+        and value.__module__ == ietf_interface.__name__
+    ]
+    changed = False
+    for cls in models:
+        for info in cls.model_fields.values():
+            if type(info.default) is list and not info.default:
+                info.default = EMPTY
+                changed = True
+    if changed:
+        # Definition order: nested classes are rebuilt before their parents.
+        for cls in models:
+            cls.model_rebuild(force=True)
+
+
+if __name__ == "__main__":
+    import gc
+    import time
+    from functools import partial
+
+    from models.ietf_interface import InterfacesContainer, Model
+
+    n, runs = 10_000, 5
+    documents = [
+        {
+            "ietf-interfaces:name": f"eth{i}",
+            "ietf-interfaces:type": "iana-if-type:ethernetCsmacd",
+            "ietf-interfaces:admin-status": "up",
+            "ietf-interfaces:oper-status": "up",
+            "ietf-interfaces:if-index": i + 1,
+            "ietf-ip:ipv4": {},
+            "ietf-ip:ipv6": {},
+        }
+        for i in range(n)
+    ]
+
+    def best(function: Any) -> float:
+        timings = []
+        for _ in range(runs):
+            gc.collect()
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        return min(timings) * 1000
+
+    def build() -> Model:
+        return Model(
+            interfaces=InterfacesContainer.model_validate(
+                {"ietf-interfaces:interface": documents}
+            )
+        )
+
+    print(f"{n:,} mostly-default interfaces, best of {runs}")
+    outputs = []
+    for label in ("copied [] defaults", "shared [] defaults"):
+        if label.startswith("shared"):
+            share_defaults()
+        model = build()
+        validated = best(build)
+        dumps = {
+            option: best(
+                partial(model.model_dump_json, by_alias=True, **{option: True})
+            )
+            for option in ("exclude_defaults", "exclude_unset")
+        }
+        outputs.append(model.model_dump_json(by_alias=True, exclude_defaults=True))
+        print(
+            f"{label}: validate {validated:6.1f} ms, dump_json exclude_defaults "
+            f"{dumps['exclude_defaults']:5.1f} ms (exclude_unset "
+            f"{dumps['exclude_unset']:5.1f} ms)"
+        )
+    assert outputs[0] == outputs[1]
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, Optional, Type
+
+GENERATED = "models.ietf_interface"
+
+
+def description(cls: Type[Any], field: Optional[str] = None) -> Optional[str]:
+    """
+    The description of a generated class, or of its attribute `field`, e.g.
+    `description(InterfaceListEntry2, "oper_status")`; `None` if it has none.
+    """
+    key = cls.__qualname__ if field is None else f"{cls.__qualname__}.{field}"
+    text = descriptions(cls.__module__).get(key)
+    return None if text is None else inspect.cleandoc(text)
+
+
+def restore(module: str = GENERATED) -> None:
+    """
+    Give the classes of `module` their descriptions back as a lazily loaded
+    `__doc__`, after the module was imported without docstrings.
+
+    Python's `-OO` flag (or `PYTHONOPTIMIZE=2`) compiles and caches modules
+    without docstrings, so the YANG descriptions are neither loaded nor kept
+    by processes that never ask for them. After `restore()`, `help()`,
+    `inspect.getdoc()` and the JSON schema `description` read them from the
+    store on first use. `-OO` applies to the whole process: every module
+    loses its docstrings and `assert` statements are skipped.
+
+    Classes that kept their docstring are left alone. Idempotent.
+    """
+    imported = importlib.import_module(module)
+    doc = _Description()
+    for value in vars(imported).values():
+        if (
+            isinstance(value, type)
+            and value.__module__ == module
+            and value.__doc__ is None
+            and value.__qualname__ in descriptions(module)
+        ):
+            value.__doc__ = doc
+
+
+def store_path(module: str = GENERATED) -> str:
+    """
+    The description store of `module`: JSON next to its source, e.g.
+    `models/ietf_interface.descriptions.json`.
+    """
+    origin = importlib.util.find_spec(module).origin
+    return f"{os.path.splitext(origin)[0]}.descriptions.json"
+
+
+def write_store(module: str = GENERATED) -> str:
+    """
+    Extract the class and attribute docstrings of `module` from its source
+    into its store, with the SHA-256 of the source it was extracted from;
+    run after regenerating the models. Returns the path.
+    """
+    origin = importlib.util.find_spec(module).origin
+    with open(origin, "rb") as file:
+        source = file.read()
+    store = {
+        "source": hashlib.sha256(source).hexdigest(),
+        "descriptions": _parse(source, origin),
+    }
+    path = store_path(module)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(store, file, indent=1, ensure_ascii=False)
+        file.write("\n")
+    descriptions.cache_clear()
+    return path
+
+
+@lru_cache(maxsize=None)
+def descriptions(module: str) -> Dict[str, str]:
+    """
+    Class (`"Cls"`) and attribute (`"Cls.attr"`) docstrings of a module, as
+    written, loaded from its store on first use.
+    """
+    with open(store_path(module), encoding="utf-8") as file:
+        return json.load(file)["descriptions"]
+
+
+def _parse(source: bytes, path: str) -> Dict[str, str]:
+    found = {}
+    for node in ast.parse(source, path).body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        if _docstring(node.body[0]) is not None:
+            found[node.name] = _docstring(node.body[0])
+        for previous, statement in zip(node.body, node.body[1:]):
+            name = _target(previous)
+            text = _docstring(statement)
+            if name is not None and text is not None:
+                found[f"{node.name}.{name}"] = text
+    return found
+
+
+def _docstring(statement: ast.stmt) -> Optional[str]:
+    if (
+        isinstance(statement, ast.Expr)
+        and isinstance(statement.value, ast.Constant)
+        and isinstance(statement.value.value, str)
+    ):
+        return statement.value.value
+    return None
+
+
+def _target(statement: ast.stmt) -> Optional[str]:
+    if isinstance(statement, ast.AnnAssign) and isinstance(statement.target, ast.Name):
+        return statement.target.id
+    if (
+        isinstance(statement, ast.Assign)
+        and len(statement.targets) == 1
+        and isinstance(statement.targets[0], ast.Name)
+    ):
+        return statement.targets[0].id
+    return None
+
+
+class _Description:
+    """
+    Lazy `__doc__` of a class imported without docstrings.
+    """
+
+    def __get__(self, instance: Any, owner: Type[Any]) -> Optional[str]:
+        return descriptions(owner.__module__).get(owner.__qualname__)
+
+
+_IMPORT = """
+import hashlib, json, os, sys, time
+import pydantic
+def resident():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+before, start = resident(), time.perf_counter()
+import models.ietf_interface
+elapsed, rss = time.perf_counter() - start, resident() - before
+from models import descriptions
+descriptions.restore()
+schema = models.ietf_interface.Model.model_json_schema(by_alias=True)
+digest = hashlib.sha256(json.dumps(schema).encode()).hexdigest()
+print(elapsed, rss, digest)
+"""
+
+
+if __name__ == "__main__":
+    import marshal
+    import statistics
+    import subprocess
+    import sys
+    import tempfile
+
+    path = write_store()
+    origin = importlib.util.find_spec(GENERATED).origin
+    with open(origin, "rb") as file:
+        source = file.read()
+    lines = source.count(b"\n")
+    sizes = [
+        len(marshal.dumps(compile(source, origin, "exec", optimize=level)))
+        for level in (0, 2)
+    ]
+    print(
+        f"{origin}: {lines:,} lines, bytecode {sizes[0]:,} bytes, "
+        f"{sizes[1]:,} bytes without docstrings; store {os.path.getsize(path):,} "
+        f"bytes ({len(descriptions(GENERATED))} descriptions)"
+    )
+
+    def imported(flags: list, cache: str) -> list:
+        environment = dict(os.environ, PYTHONPYCACHEPREFIX=cache)
+        for name in ("PYTHONDONTWRITEBYTECODE", "PYTHONOPTIMIZE"):
+            environment.pop(name, None)
+        output = subprocess.run(
+            [sys.executable, *flags, "-c", _IMPORT],
+            env=environment,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        return output.split()
+
+    runs = 11
+    digests = set()
+    with tempfile.TemporaryDirectory() as cache:
+        for label, flags in (("regular", []), ("-OO", ["-OO"])):
+            # The first import writes the bytecode caches.
+            imported(flags, cache)
+            results = [imported(flags, cache) for _ in range(runs)]
+            digests.update(digest for _, _, digest in results)
+            elapsed = statistics.median(float(elapsed) for elapsed, _, _ in results)
+            rss = statistics.median(int(rss) for _, rss, _ in results)
+            print(
+                f"{label:<8} import: {elapsed * 1000:6.1f} ms, "
+                f"{rss / 2**20:5.1f} MiB resident (median of {runs})"
+            )
+    # JSON schemas with descriptions restored from the store are identical.
+    assert len(digests) == 1
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import time as _time
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from models.ietf_interface import EnumerationEnum9, InterfacesStateContainer
+from models.yang_types import DateAndTime
+
+_STATUSES = list(EnumerationEnum9)
+_CODES: Dict[object, int] = {
+    **{status: code for code, status in enumerate(_STATUSES)},
+    # Compact models (`models.compact`) hold the string values.
+    **{status.value: code for code, status in enumerate(_STATUSES)},
+}
+_UP = _CODES[EnumerationEnum9.up]
+
+
+class Run(NamedTuple):
+    start: int
+    """
+    Nanoseconds since the Unix epoch.
+    """
+    status: EnumerationEnum9
+
+
+def _start(last_change: Optional[str], now: int) -> int:
+    """
+    The instant of `last_change`, or `now` if there is none or it is not a
+    valid date and time, e.g. February 30th.
+    """
+    if last_change is None:
+        return now
+    try:
+        return DateAndTime(last_change).epoch_ns
+    except ValueError:
+        return now
+
+
+class StatusHistory:
+    """
+    `oper-status` history of every interface, recorded from periodic polls
+    of `interfaces-state` as transitions only.
+
+    Each interface's history is a run-length encoding: the start times and
+    `EnumerationEnum9` codes of its runs, in parallel `array`/`bytearray`
+    buffers. A run starts at the entry's `last-change` when the device
+    reports one, otherwise at the time of the poll that saw the change. A
+    `last-change` that advances while the status stays the same means the
+    interface bounced between two polls; that starts a new run with the same
+    status, which `flaps()` counts.
+
+    `poll()` compares a whole poll against the previous statuses and
+    `last-change` values with numpy and touches only the interfaces that
+    changed. Queries bisect the runs,
+    so their cost depends on the number of transitions in the window, not on
+    the number of polls.
+    """
+
+    def __init__(self) -> None:
+        self.polled: Optional[int] = None
+        """
+        Time of the latest poll; histories are known up to this instant.
+        """
+        self._index: Dict[str, int] = {}
+        self._starts: List[array] = []
+        self._codes: List[bytearray] = []
+        self._status = np.zeros(0, object)
+        self._last_change = np.zeros(0, object)
+        self._names: List[str] = []
+        self._positions = np.zeros(0, np.intp)
+
+    def poll(self, state: InterfacesStateContainer, time: Optional[int] = None) -> int:
+        """
+        Record the statuses in `state`, polled at `time` (nanoseconds since
+        the Unix epoch, now by default). Returns the number of runs started.
+        """
+        now = _time.time_ns() if time is None else time
+        entries = state.interface or []
+        names = [entry.name for entry in entries]
+        if names != self._names:
+            self._locate(names)
+        positions = self._positions
+        # Compared as objects: members are singletons, so unchanged statuses
+        # compare by identity without hashing the `Enum`.
+        statuses = np.empty(len(entries), object)
+        statuses[:] = [entry.oper_status for entry in entries]
+        last_changes = np.empty(len(entries), object)
+        last_changes[:] = [entry.last_change for entry in entries]
+
+        moved = last_changes != self._last_change[positions]
+        changed = np.flatnonzero((statuses != self._status[positions]) | moved)
+        # Every start is known before any history changes.
+        starts_at = [
+            _start(last_changes[k], now) if moved[k] else now for k in changed.tolist()
+        ]
+        for k, start in zip(changed.tolist(), starts_at):
+            position = int(positions[k])
+            starts = self._starts[position]
+            if starts:
+                # Clock steps on the device must not reorder the runs.
+                start = max(start, starts[-1])
+            starts.append(start)
+            self._codes[position].append(_CODES[statuses[k]])
+        self._status[positions] = statuses
+        self._last_change[positions] = last_changes
+        self.polled = now
+        return len(changed)
+
+    def _locate(self, names: List[str]) -> None:
+        positions = []
+        for name in names:
+            position = self._index.get(name)
+            if position is None:
+                position = self._index[name] = len(self._starts)
+                self._starts.append(array("q"))
+                self._codes.append(bytearray())
+            positions.append(position)
+        grown = len(self._starts) - len(self._status)
+        if grown:
+            self._status = np.concatenate((self._status, np.full(grown, None, object)))
+            self._last_change = np.concatenate(
+                (self._last_change, np.full(grown, None, object))
+            )
+        self._names = names
+        self._positions = np.array(positions, np.intp)
+
+    def runs(self, name: str) -> List[Run]:
+        position = self._index[name]
+        return [
+            Run(start, _STATUSES[code])
+            for start, code in zip(self._starts[position], self._codes[position])
+        ]
+
+    def status(self, name: str, at: int) -> Optional[EnumerationEnum9]:
+        """
+        Status of `name` at `at`; `None` before it was first seen.
+        """
+        position = self._index[name]
+        run = bisect_right(self._starts[position], at) - 1
+        return None if run < 0 else _STATUSES[self._codes[position][run]]
+
+    def uptime(self, name: str, start: int, end: int) -> int:
+        """
+        Nanoseconds `name` spent `up` between `start` and `end`. Time before
+        the interface was first seen or after the latest poll is not up.
+        """
+        position = self._index[name]
+        starts, codes = self._starts[position], self._codes[position]
+        end = min(end, self.polled)
+        total = 0
+        run = max(bisect_right(starts, start) - 1, 0)
+        while run < len(starts) and starts[run] < end:
+            if codes[run] == _UP:
+                stop = starts[run + 1] if run + 1 < len(starts) else end
+                total += max(min(stop, end) - max(starts[run], start), 0)
+            run += 1
+        return total
+
+    def flaps(self, name: str, start: int, end: int) -> int:
+        """
+        Times `name` left `up` after `start` and up to `end`, counting a
+        bounce between two polls once.
+        """
+        position = self._index[name]
+        starts, codes = self._starts[position], self._codes[position]
+        first = max(bisect_right(starts, start), 1)
+        last = bisect_right(starts, end)
+        return sum(
+            1
+            for run in range(first, last)
+            if codes[run - 1] == codes[run] or codes[run - 1] == _UP
+        )
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+if __name__ == "__main__":
+    import gc
+    import random
+    import sys
+    from datetime import datetime, timezone
+
+    from models import synthetic
+
+    n, polls, interval = 100_000, 60, 10 * 10**9
+    state = InterfacesStateContainer.model_validate(synthetic.state_payload(n))
+    entries = state.interface
+    names = [entry.name for entry in entries]
+    rng = random.Random(0)
+    history = StatusHistory()
+    # Polls start after the synthetic entries' last changes.
+    t0 = 1_710_000_000 * 10**9
+    gc.collect()
+
+    elapsed = []
+    changes = 0
+    for poll in range(polls):
+        now = t0 + poll * interval
+        if poll:
+            # About 0.1% of interfaces change between two polls.
+            for entry in rng.sample(entries, n // 1000):
+                entry.oper_status = (
+                    EnumerationEnum9.down
+                    if entry.oper_status is EnumerationEnum9.up
+                    else EnumerationEnum9.up
+                )
+                changed = datetime.fromtimestamp(now // 10**9 - 3, timezone.utc)
+                entry.last_change = f"{changed:%Y-%m-%dT%H:%M:%SZ}"
+        start = _time.perf_counter()
+        changes += history.poll(state, now)
+        elapsed.append(_time.perf_counter() - start)
+    buffers = sum(
+        sys.getsizeof(starts) + sys.getsizeof(codes)
+        for starts, codes in zip(history._starts, history._codes)
+    )
+    print(
+        f"{n:,} interfaces, {polls} polls: first poll {elapsed[0] * 1000:.0f} ms, "
+        f"later polls {sum(elapsed[1:]) / (polls - 1) * 1000:.0f} ms on average; "
+        f"{changes:,} runs in {buffers / 2**20:.1f} MiB "
+        f"(vs {n * polls:,} samples polled)"
+    )
+
+    window = (t0 + 5 * interval, t0 + 45 * interval)
+    start = _time.perf_counter()
+    uptime = sum(history.uptime(name, *window) for name in names)
+    flaps = sum(history.flaps(name, *window) for name in names)
+    elapsed = _time.perf_counter() - start
+    print(
+        f"uptime and flaps of every interface over a window: {elapsed * 1000:.0f} "
+        f"ms ({elapsed / n * 1e6:.2f} us per interface), "
+        f"{uptime / (n * (window[1] - window[0])):.1%} up, {flaps:,} flaps"
+    )
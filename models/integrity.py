@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+from pydantic_core import PydanticCustomError
+
+from models.ietf_interface import Model
+from models.interface_stack import Entry
+
+INTERFACES = ("ietf-interfaces:interfaces", "ietf-interfaces:interface")
+INTERFACES_STATE = ("ietf-interfaces:interfaces-state", "ietf-interfaces:interface")
+
+MESSAGES = {
+    "duplicate_key": "duplicate list key {value}, first used at index {first}",
+    "duplicate_unique": "value {value} is not unique, first used at index {first}",
+    "leafref": "{value} does not refer to an existing interface",
+    "missing_state": "configured interface {value} has no operational state entry",
+}
+
+
+class Violation(NamedTuple):
+    type: str
+    loc: Tuple[Any, ...]
+    value: Any
+    first: Optional[int] = None
+
+    @property
+    def message(self) -> str:
+        return MESSAGES[self.type].format(value=self.value, first=self.first)
+
+
+def check_integrity(model: Model, require_state: bool = False) -> List[Violation]:
+    """
+    Whole-document checks that field validation cannot express.
+
+    - list keys are unique: interface `name`, address and neighbor `ip`
+    - `if-index` is unique per interface list (it mirrors IF-MIB ifIndex)
+    - every `higher-layer-if`/`lower-layer-if` refers to an interface in the
+      same tree (config leafrefs resolve against config, state against state)
+    - with `require_state=True`, every configured interface has a state entry
+
+    Each list is indexed once in a hash set, so the pass is linear in the
+    document size. All violations are returned, none is raised.
+    """
+    violations: List[Violation] = []
+    config = model.interfaces.interface if model.interfaces else None
+    state = model.interfaces_state.interface if model.interfaces_state else None
+
+    _check_interfaces(config or [], INTERFACES, violations)
+    state_names = _check_interfaces(state or [], INTERFACES_STATE, violations)
+
+    if require_state and config is not None:
+        for i, entry in enumerate(config):
+            if entry.name not in state_names:
+                loc = (*INTERFACES, i, "ietf-interfaces:name")
+                violations.append(Violation("missing_state", loc, entry.name))
+    return violations
+
+
+def validate_integrity(model: Model, require_state: bool = False) -> Model:
+    """
+    Run `check_integrity` and raise a `ValidationError` carrying every
+    violation, with alias locations like the ones reported by
+    `Model.model_validate`.
+    """
+    violations = check_integrity(model, require_state)
+    if violations:
+        raise ValidationError.from_exception_data(
+            Model.__name__,
+            [
+                {
+                    "type": PydanticCustomError(v.type, v.message),
+                    "loc": v.loc,
+                    "input": v.value,
+                }
+                for v in violations
+            ],
+        )
+    return model
+
+
+def _check_interfaces(
+    entries: Sequence[Entry], prefix: Tuple[str, ...], violations: List[Violation]
+) -> Dict[str, int]:
+    names = unique(
+        ((i, e.name) for i, e in enumerate(entries)),
+        prefix,
+        "ietf-interfaces:name",
+        "duplicate_key",
+        violations,
+    )
+    unique(
+        ((i, e.if_index) for i, e in enumerate(entries)),
+        prefix,
+        "ietf-interfaces:if-index",
+        "duplicate_unique",
+        violations,
+    )
+    for i, entry in enumerate(entries):
+        for leaf, targets in (
+            ("ietf-interfaces:higher-layer-if", entry.higher_layer_if),
+            ("ietf-interfaces:lower-layer-if", entry.lower_layer_if),
+        ):
+            for k, target in enumerate(targets or ()):
+                if target not in names:
+                    loc = (*prefix, i, leaf, k)
+                    violations.append(Violation("leafref", loc, target))
+        for family in ("ipv4", "ipv6"):
+            container = getattr(entry, family)
+            if container is None:
+                continue
+            for leaf in ("address", "neighbor"):
+                items = getattr(container, leaf)
+                if items:
+                    unique(
+                        enumerate(item.ip for item in items),
+                        (*prefix, i, f"ietf-ip:{family}", f"ietf-ip:{leaf}"),
+                        "ietf-ip:ip",
+                        "duplicate_key",
+                        violations,
+                    )
+    return names
+
+
+def unique(
+    values: Iterable[Tuple[int, Any]],
+    prefix: Tuple[Any, ...],
+    leaf: str,
+    kind: str,
+    violations: List[Violation],
+) -> Dict[Any, int]:
+    """
+    Check that the values of `(position, value)` pairs are unique, adding a
+    `kind` violation at `(*prefix, position, leaf)` for every repeated value,
+    where `leaf` is the YANG name (alias) of the field. Returns the position
+    each value is first used at.
+    """
+    first: Dict[Any, int] = {}
+    for i, value in values:
+        j = first.setdefault(value, i)
+        if j != i:
+            violations.append(Violation(kind, (*prefix, i, leaf), value, j))
+    return first
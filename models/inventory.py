@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import sqlite3
+from enum import Enum
+from types import TracebackType
+from typing import Any, List, NamedTuple, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel
+from typing_extensions import Self
+
+from models.ietf_interface import InterfaceListEntry, InterfaceListEntry2, Model
+
+Entry = Union[InterfaceListEntry, InterfaceListEntry2]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interface (
+    id INTEGER PRIMARY KEY,
+    device TEXT NOT NULL,
+    state INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    admin_status TEXT,
+    oper_status TEXT,
+    if_index INTEGER,
+    data TEXT NOT NULL,
+    UNIQUE (device, state, name)
+);
+CREATE INDEX IF NOT EXISTS interface_name ON interface (name);
+CREATE INDEX IF NOT EXISTS interface_type ON interface (type);
+CREATE INDEX IF NOT EXISTS interface_oper_status ON interface (oper_status);
+CREATE TABLE IF NOT EXISTS address (
+    interface INTEGER NOT NULL REFERENCES interface (id),
+    ip TEXT NOT NULL,
+    prefix_length INTEGER,
+    origin TEXT,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS address_ip ON address (ip);
+CREATE INDEX IF NOT EXISTS address_interface ON address (interface);
+CREATE TABLE IF NOT EXISTS neighbor (
+    interface INTEGER NOT NULL REFERENCES interface (id),
+    ip TEXT NOT NULL,
+    link_layer_address TEXT,
+    origin TEXT,
+    state TEXT
+);
+CREATE INDEX IF NOT EXISTS neighbor_ip ON neighbor (ip);
+CREATE INDEX IF NOT EXISTS neighbor_interface ON neighbor (interface);
+"""
+
+_COLUMNS = "interface.device, interface.state, interface.data"
+_ENTRIES: Tuple[Type[BaseModel], Type[BaseModel]] = (
+    InterfaceListEntry,
+    InterfaceListEntry2,
+)
+
+
+class Match(NamedTuple):
+    device: str
+    entry: Entry
+
+
+class Inventory:
+    """
+    Interfaces of many devices in an SQLite database, queryable without
+    loading any device's whole `Model`.
+
+    Each `InterfaceListEntry` (config, `state=False`) and
+    `InterfaceListEntry2` (state, `state=True`) is one `interface` row:
+    its key and status leaves in indexed columns and the entry itself as
+    JSON, which is validated again when the entry is loaded. IPv4 and IPv6
+    addresses and neighbors are rows of the `address` and `neighbor` tables,
+    indexed on `ip`. Enumerations are stored as their YANG values.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(_SCHEMA)
+
+    def store(self, device: str, model: Model) -> None:
+        """
+        Replace everything stored for `device` with the interfaces of
+        `model`, in one transaction.
+        """
+        with self.connection:
+            self._delete(device)
+            for state, container in (
+                (False, model.interfaces),
+                (True, model.interfaces_state),
+            ):
+                if container is not None and container.interface:
+                    self._insert(device, state, container.interface)
+
+    def delete(self, device: str) -> None:
+        with self.connection:
+            self._delete(device)
+
+    def _delete(self, device: str) -> None:
+        owned = "SELECT id FROM interface WHERE device = ?"
+        self.connection.execute(
+            f"DELETE FROM address WHERE interface IN ({owned})", (device,)
+        )
+        self.connection.execute(
+            f"DELETE FROM neighbor WHERE interface IN ({owned})", (device,)
+        )
+        self.connection.execute("DELETE FROM interface WHERE device = ?", (device,))
+
+    def _insert(self, device: str, state: bool, entries: List[Entry]) -> None:
+        cursor = self.connection.execute(
+            "SELECT coalesce(max(id), 0) FROM interface"
+        ).fetchone()
+        first = cursor[0] + 1
+        rows, addresses, neighbors = [], [], []
+        for id_, entry in enumerate(entries, first):
+            rows.append(
+                (
+                    id_,
+                    device,
+                    state,
+                    entry.name,
+                    entry.type,
+                    _value(entry.admin_status),
+                    _value(entry.oper_status),
+                    entry.if_index,
+                    entry.__pydantic_serializer__.to_json(entry, by_alias=True),
+                )
+            )
+            for family in (entry.ipv4, entry.ipv6):
+                if family is None:
+                    continue
+                for address in family.address or ():
+                    prefix_length = getattr(address, "prefix_length", None)
+                    if prefix_length is None:
+                        subnet = getattr(address, "subnet", None)
+                        prefix_length = getattr(subnet, "prefix_length", None)
+                    addresses.append(
+                        (
+                            id_,
+                            address.ip,
+                            prefix_length,
+                            _value(address.origin),
+                            _value(getattr(address, "status", None)),
+                        )
+                    )
+                for neighbor in family.neighbor or ():
+                    neighbors.append(
+                        (
+                            id_,
+                            neighbor.ip,
+                            neighbor.link_layer_address,
+                            _value(neighbor.origin),
+                            _value(getattr(neighbor, "state", None)),
+                        )
+                    )
+        self.connection.executemany(
+            "INSERT INTO interface VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        self.connection.executemany(
+            "INSERT INTO address VALUES (?, ?, ?, ?, ?)", addresses
+        )
+        self.connection.executemany(
+            "INSERT INTO neighbor VALUES (?, ?, ?, ?, ?)", neighbors
+        )
+
+    def devices(self) -> List[str]:
+        return [
+            device
+            for (device,) in self.connection.execute(
+                "SELECT DISTINCT device FROM interface ORDER BY device"
+            )
+        ]
+
+    def get(self, device: str, name: str, state: bool = True) -> Optional[Entry]:
+        """
+        The interface `name` of `device`, or `None`.
+        """
+        row = self.connection.execute(
+            f"SELECT {_COLUMNS} FROM interface "
+            "WHERE device = ? AND state = ? AND name = ?",
+            (device, state, name),
+        ).fetchone()
+        return None if row is None else _match(row).entry
+
+    def find(
+        self,
+        name: Optional[str] = None,
+        type: Optional[str] = None,
+        oper_status: Optional[Union[Enum, str]] = None,
+        ip: Optional[str] = None,
+        neighbor: Optional[str] = None,
+        state: Optional[bool] = True,
+        device: Optional[str] = None,
+    ) -> List[Match]:
+        """
+        Interfaces matching every condition given, across devices, e.g.
+        `find(oper_status="down", type="iana-if-type:ethernetCsmacd")`. `ip`
+        matches an interface address, `neighbor` a neighbor's address;
+        `state=None` searches config and state entries.
+        """
+        conditions: List[Tuple[str, Any]] = [
+            (f"interface.{column} = ?", value)
+            for column, value in (
+                ("name", name),
+                ("type", type),
+                ("oper_status", _value(oper_status)),
+                ("state", state),
+                ("device", device),
+            )
+            if value is not None
+        ]
+        for table, value in (("address", ip), ("neighbor", neighbor)):
+            if value is not None:
+                conditions.append(
+                    (
+                        f"interface.id IN (SELECT interface FROM {table} WHERE ip = ?)",
+                        value,
+                    )
+                )
+        where = " AND ".join(condition for condition, _ in conditions) or "1"
+        rows = self.connection.execute(
+            f"SELECT {_COLUMNS} FROM interface WHERE {where} ORDER BY interface.id",
+            [value for _, value in conditions],
+        )
+        return [_match(row) for row in rows]
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def _match(row: Tuple[str, int, str]) -> Match:
+    device, state, data = row
+    return Match(device, _ENTRIES[state].model_validate_json(data))
+
+
+def _value(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+if __name__ == "__main__":
+    import gc
+    import os
+    import random
+    import tempfile
+    import time
+
+    from models import synthetic
+
+    devices, n, neighbors, lookups = 1_000, 50, 4, 10_000
+    model = synthetic.model(n, neighbors)
+    blob = model.model_dump_json(by_alias=True)
+    names = [entry.name for entry in model.interfaces_state.interface]
+    rng = random.Random(0)
+    targets = [
+        (f"device{rng.randrange(devices)}", rng.choice(names)) for _ in range(lookups)
+    ]
+    gc.collect()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "inventory.db")
+        with Inventory(path) as inventory:
+            start = time.perf_counter()
+            for device in range(devices):
+                inventory.store(f"device{device}", model)
+            elapsed = time.perf_counter() - start
+            print(
+                f"ingest {devices:,} devices x {n} interfaces x {neighbors} "
+                f"neighbors: {elapsed:.2f} s ({devices / elapsed:,.0f} devices/s), "
+                f"database {os.path.getsize(path) / 2**20:.0f} MiB"
+            )
+
+            start = time.perf_counter()
+            assert all(inventory.get(device, name) for device, name in targets)
+            elapsed = time.perf_counter() - start
+            print(f"get(device, name): {elapsed / lookups * 1e6:7.1f} us per lookup")
+
+            start = time.perf_counter()
+            for device, name in targets[:100]:
+                state = Model.model_validate_json(blob).interfaces_state
+                next(entry for entry in state.interface if entry.name == name)
+            elapsed = time.perf_counter() - start
+            print(f"JSON blob baseline: {elapsed / 100 * 1e6:7.1f} us per lookup")
+
+            address = model.interfaces.interface[7].ipv4.address[0].ip
+            neighbor = model.interfaces_state.interface[7].ipv6.neighbor[0].ip
+            for label, query in (
+                ("find(ip=...)", {"ip": address, "state": False}),
+                ("find(neighbor=...)", {"neighbor": neighbor}),
+                (
+                    "find(name=..., oper_status=...)",
+                    {"name": "eth1", "oper_status": "up"},
+                ),
+            ):
+                start = time.perf_counter()
+                matches = inventory.find(**query)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{label:<32} {len(matches):5,} matches in {elapsed * 1000:7.1f} ms"
+                )
+            start = time.perf_counter()
+            count = inventory.connection.execute(
+                "SELECT count(*) FROM interface WHERE state AND oper_status = 'down'"
+            ).fetchone()[0]
+            elapsed = time.perf_counter() - start
+            print(f"count of down interfaces: {count:,} in {elapsed * 1000:.1f} ms")
@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+from enum import Enum
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type, get_args
+from urllib.parse import quote
+
+from pydantic import BaseModel
+
+FANOUT = 64
+"""
+Buckets per level of the two-level hash trie over each keyed list; 4096 leaf
+buckets in total, a dozen entries each for a 50k-entry list.
+"""
+
+
+_POSITIONS = [i.to_bytes(2, "big") for i in range(FANOUT * FANOUT)]
+
+
+class Difference(NamedTuple):
+    path: str
+    """
+    RESTCONF-style path of the differing node, e.g.
+    `/interfaces/interface=eth1/ipv4/address=10.0.0.1/origin`.
+    """
+    kind: str
+    """
+    `changed`, `added` (only in the second tree) or `removed` (only in the
+    first).
+    """
+
+
+def _encode(value: Any) -> bytes:
+    """
+    Canonical bytes of a leaf or leaf-list value: tagged and self-delimiting,
+    so that concatenated encodings never run into each other.
+    """
+    # Exact types first: this runs for every leaf of the tree.
+    kind = type(value)
+    if kind is str:
+        data = value.encode()
+        return b"s%d:%b" % (len(data), data)
+    if kind is int:
+        return b"i%d;" % value
+    if value is None:
+        return b"n"
+    if kind is bool:
+        return b"t" if value else b"f"
+    if isinstance(value, Enum):
+        return _encode(value.value)
+    if isinstance(value, (int, float)):
+        return b"i%b;" % repr(value).encode()
+    if isinstance(value, list):
+        return b"[%d:%b" % (len(value), b"".join(_encode(item) for item in value))
+    data = str(value).encode()
+    return b"s%d:%b" % (len(data), data)
+
+
+def _bucket(key: Any) -> int:
+    digest = blake2b(_encode(key), digest_size=4).digest()
+    return int.from_bytes(digest, "big") % (FANOUT * FANOUT)
+
+
+def _combine(digests: List[bytes]) -> bytes:
+    return blake2b(b"".join(digests), digest_size=16).digest()
+
+
+def _sparse(digests: Dict[int, bytes]) -> bytes:
+    """
+    Digest of the non-empty slots of one trie level, tagged by position.
+    """
+    return _combine([_POSITIONS[i] + digests[i] for i in sorted(digests)])
+
+
+def _key(entry: BaseModel) -> Any:
+    # pydantify emits the list key leaf first.
+    return entry.__dict__[next(iter(type(entry).model_fields))]
+
+
+def _keyed(value: Any) -> bool:
+    return isinstance(value, list) and bool(value) and isinstance(value[0], BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _fields(cls: Type[BaseModel]) -> Tuple[Tuple[str, bytes, bool], ...]:
+    """
+    `(attribute, encoded YANG name, whether it may hold nodes)` for each field.
+    """
+    return tuple(
+        (attr, _encode(info.alias or attr), _has_model(info.annotation))
+        for attr, info in cls.model_fields.items()
+    )
+
+
+def _has_model(annotation: Any) -> bool:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return True
+    return any(_has_model(argument) for argument in get_args(annotation))
+
+
+class _KeyedList:
+    """
+    Digests of one keyed list, grouped into a two-level trie of buckets by a
+    hash of the entry key, so that replacing an entry rehashes one leaf
+    bucket, one top bucket and the root, and two lists can be compared bucket
+    by bucket. Only non-empty buckets are stored, so short lists stay cheap.
+    The digest does not depend on entry order.
+    """
+
+    def __init__(self, items: List[BaseModel], tree: MerkleTree):
+        self.items = items
+        self.entries: Dict[Any, BaseModel] = {}
+        self.keys: Dict[int, Any] = {}
+        self.buckets: Dict[int, Dict[Any, bytes]] = {}
+        for entry in items:
+            key = self.keys[id(entry)] = _key(entry)
+            self.entries[key] = entry
+            digest = tree._cached(entry) or tree._hash(entry)
+            self.buckets.setdefault(_bucket(key), {})[key] = digest
+        self.leaves = {b: self._leaf(b) for b in self.buckets}
+        groups: Dict[int, Dict[int, bytes]] = {}
+        for bucket, digest in self.leaves.items():
+            groups.setdefault(bucket // FANOUT, {})[bucket] = digest
+        self.tops = {top: _sparse(leaves) for top, leaves in groups.items()}
+        self.digest = _sparse(self.tops)
+
+    def _leaf(self, bucket: int) -> bytes:
+        ordered = sorted(self.buckets[bucket].items(), key=lambda m: _encode(m[0]))
+        return _combine([_encode(key) + digest for key, digest in ordered])
+
+    def stale(self) -> bool:
+        """
+        Whether entries were added, removed or replaced since this was built.
+        """
+        return len(self.items) != len(self.keys) or any(
+            self.entries.get(self.keys.get(id(entry))) is not entry
+            for entry in self.items
+        )
+
+    def replace(self, entry: BaseModel, digest: bytes) -> None:
+        old, key = self.keys[id(entry)], _key(entry)
+        self.keys[id(entry)] = key
+        del self.entries[old], self.buckets[_bucket(old)][old]
+        self.entries[key] = entry
+        self.buckets.setdefault(_bucket(key), {})[key] = digest
+        touched = {_bucket(old), _bucket(key)}
+        for bucket in touched:
+            if self.buckets[bucket]:
+                self.leaves[bucket] = self._leaf(bucket)
+            else:
+                del self.buckets[bucket], self.leaves[bucket]
+        for top in {bucket // FANOUT for bucket in touched}:
+            start = top * FANOUT
+            leaves = {
+                b: self.leaves[b]
+                for b in range(start, start + FANOUT)
+                if b in self.leaves
+            }
+            if leaves:
+                self.tops[top] = _sparse(leaves)
+            else:
+                del self.tops[top]
+        self.digest = _sparse(self.tops)
+
+
+class MerkleTree:
+    """
+    Content digests for every node of a model tree.
+
+    A container's digest covers its leaves (by YANG name and canonical value)
+    and the digests of its child nodes; a keyed list's digest is the root of a
+    hash trie over its entries (see `FANOUT`), independent of entry order.
+    Two trees are equal iff their root digests are, and `diff()` descends only
+    into subtrees and buckets whose digests differ.
+
+    Digests are cached per node. After changing leaves of a node in place,
+    call `update(node)`: it rehashes that node and its ancestors only, which
+    for a list entry means one entry, two trie buckets and the path to the
+    root. Child nodes that were replaced, and entries added to or removed
+    from lists held by `node`, are picked up by the same call, the latter at
+    the cost of rehashing that list.
+    """
+
+    def __init__(self, root: BaseModel):
+        self.root = root
+        self._digests: Dict[int, Tuple[BaseModel, bytes]] = {}
+        self._lists: Dict[int, _KeyedList] = {}
+        # Child -> (child, parent, the list holding the child if any).
+        self._parents: Dict[int, Tuple[BaseModel, BaseModel, Optional[List[Any]]]] = {}
+        self._hash(root)
+
+    @property
+    def digest(self) -> bytes:
+        return self._digests[id(self.root)][1]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MerkleTree):
+            return NotImplemented
+        return self.digest == other.digest
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def update(self, node: BaseModel) -> None:
+        """
+        Rehash `node` after it was changed in place, and its ancestors.
+        """
+        for value in node.__dict__.values():
+            if _keyed(value) and self._keyed(value).stale():
+                self._lists[id(value)] = _KeyedList(value, self)
+        digest = self._hash(node)
+        parent = self._parent(node)
+        while parent is not None:
+            owner, items = parent
+            if items is not None:
+                self._keyed(items).replace(node, digest)
+            node = owner
+            digest = self._store(node)
+            parent = self._parent(node)
+
+    def _parent(
+        self, node: BaseModel
+    ) -> Optional[Tuple[BaseModel, Optional[List[Any]]]]:
+        parent = self._parents.get(id(node))
+        # As in `_digests`, the entry holds the child, so that its id is not
+        # reused while the entry exists, and is checked to be `node`.
+        return parent[1:] if parent is not None and parent[0] is node else None
+
+    def _cached(self, node: BaseModel) -> Optional[bytes]:
+        cached = self._digests.get(id(node))
+        # The node must be checked as well: ids of freed nodes are reused.
+        return cached[1] if cached is not None and cached[0] is node else None
+
+    def _hash(self, node: BaseModel) -> bytes:
+        fields = node.__dict__
+        for attr, _, nested in _fields(type(node)):
+            value = fields[attr]
+            if not nested or value is None:
+                continue
+            if isinstance(value, list):
+                for entry in value:
+                    self._parents[id(entry)] = (entry, node, value)
+                if value:
+                    self._keyed(value)
+            else:
+                self._parents[id(value)] = (value, node, None)
+                if self._cached(value) is None:
+                    self._hash(value)
+        return self._store(node)
+
+    def _store(self, node: BaseModel) -> bytes:
+        hasher = blake2b(digest_size=16)
+        fields = node.__dict__
+        for attr, name, nested in _fields(type(node)):
+            value = fields[attr]
+            hasher.update(name)
+            if not nested or value is None:
+                hasher.update(_encode(value))
+            elif isinstance(value, list):
+                hasher.update(b"k" + self._keyed(value).digest if value else b"[0:")
+            else:
+                hasher.update(b"m" + self._digests[id(value)][1])
+        digest = hasher.digest()
+        self._digests[id(node)] = (node, digest)
+        return digest
+
+    def _keyed(self, items: List[BaseModel]) -> _KeyedList:
+        keyed = self._lists.get(id(items))
+        if keyed is None or keyed.items is not items:
+            keyed = self._lists[id(items)] = _KeyedList(items, self)
+        return keyed
+
+    def diff(self, other: MerkleTree) -> List[Difference]:
+        """
+        Nodes that differ between this tree and `other`.
+        """
+        differences: List[Difference] = []
+        self._diff(self.root, other, other.root, "", differences)
+        return differences
+
+    def _diff(
+        self,
+        a: BaseModel,
+        other: MerkleTree,
+        b: BaseModel,
+        path: str,
+        out: List[Difference],
+    ) -> None:
+        if self._cached(a) == other._cached(b):
+            return
+        for attr, info in type(a).model_fields.items():
+            va, vb = a.__dict__[attr], b.__dict__.get(attr)
+            child = f"{path}/{(info.alias or attr).rsplit(':', 1)[-1]}"
+            if isinstance(va, BaseModel) and isinstance(vb, BaseModel):
+                self._diff(va, other, vb, child, out)
+            elif _keyed(va) and _keyed(vb):
+                self._diff_lists(self._keyed(va), other, other._keyed(vb), child, out)
+            elif (
+                _keyed(va)
+                or _keyed(vb)
+                or isinstance(va, BaseModel)
+                or isinstance(vb, BaseModel)
+            ):
+                self._presence(va, vb, child, out)
+            elif _encode(va) != _encode(vb):
+                out.append(Difference(child, "changed"))
+
+    def _presence(self, va: Any, vb: Any, path: str, out: List[Difference]) -> None:
+        """
+        One side has a container or entries where the other has none.
+        """
+        for value, kind in ((va, "removed"), (vb, "added")):
+            if isinstance(value, BaseModel):
+                out.append(Difference(path, kind))
+            elif _keyed(value):
+                out.extend(
+                    Difference(f"{path}={quote(str(_key(e)), safe=':')}", kind)
+                    for e in value
+                )
+
+    def _diff_lists(
+        self,
+        a: _KeyedList,
+        other: MerkleTree,
+        b: _KeyedList,
+        path: str,
+        out: List[Difference],
+    ) -> None:
+        if a.digest == b.digest:
+            return
+        for top in sorted(a.tops.keys() | b.tops.keys()):
+            if a.tops.get(top) == b.tops.get(top):
+                continue
+            for bucket in range(top * FANOUT, (top + 1) * FANOUT):
+                if a.leaves.get(bucket) == b.leaves.get(bucket):
+                    continue
+                ma, mb = a.buckets.get(bucket, {}), b.buckets.get(bucket, {})
+                for key in sorted(ma.keys() | mb.keys(), key=_encode):
+                    entry = f"{path}={quote(str(key), safe=':')}"
+                    if key not in mb:
+                        out.append(Difference(entry, "removed"))
+                    elif key not in ma:
+                        out.append(Difference(entry, "added"))
+                    elif ma[key] != mb[key]:
+                        self._diff(a.entries[key], other, b.entries[key], entry, out)
+
+
+if __name__ == "__main__":
+    import gc
+    import random
+    import time
+
+    from models import synthetic
+
+    def timed(function: Any, *args: Any) -> Tuple[Any, float]:
+        gc.collect()
+        start = time.perf_counter()
+        result = function(*args)
+        return result, time.perf_counter() - start
+
+    # Values that differ only in where an item or field ends must not collide.
+    entry = synthetic.model(1).interfaces.interface[0]
+    for left, right in (
+        (["x,sy"], ["x", "y"]),
+        (["x", ""], ["x"]),
+        (["ab", "c"], ["a", "bc"]),
+    ):
+        a, b = (
+            MerkleTree(entry.model_copy(update={"higher_layer_if": value}))
+            for value in (left, right)
+        )
+        assert a != b
+        assert a.diff(b) == [Difference("/higher-layer-if", "changed")]
+    assert len({_encode(v) for v in ([1, 23], [12, 3], "i1;", 1, [None], None)}) == 6
+
+    n, changes = 50_000, 10
+    rng = random.Random(0)
+    intended, running = synthetic.model(n), synthetic.model(n)
+    reference, build = timed(MerkleTree, intended)
+    observed, _ = timed(MerkleTree, running)
+    print(f"{n:,} interfaces: hashing the tree {build:.2f} s")
+
+    _, equal = timed(lambda: reference == observed)
+    _, dumps = timed(lambda: intended.model_dump_json() == running.model_dump_json())
+    _, compare = timed(lambda: intended == running)
+    print(
+        f"equality: digests {equal * 1e6:.1f} us, model_dump_json "
+        f"{dumps * 1e3:.0f} ms, == {compare * 1e3:.0f} ms"
+    )
+
+    def drift(model: BaseModel, tree: MerkleTree, count: int) -> None:
+        entries = model.interfaces.interface
+        for entry in rng.sample(entries, count):
+            if entry.ipv4 is not None and entry.ipv4.address and rng.random() < 0.5:
+                address = entry.ipv4.address[0]
+                address.__pydantic_validator__.validate_assignment(
+                    address, "origin", "random"
+                )
+                tree.update(address)
+            else:
+                entry.description = "drifted"
+                tree.update(entry)
+
+    _, updates = timed(drift, running, observed, changes)
+    found, located = timed(reference.diff, observed)
+    print(
+        f"{changes} drifts: {updates * 1e3:.2f} ms to update digests, "
+        f"{located * 1e3:.2f} ms to locate {len(found)} differences"
+    )
+
+    devices, size = 20, 5_000
+    golden = synthetic.model(size)
+    baseline = MerkleTree(golden)
+    fleet = []
+    for device in range(devices):
+        model = synthetic.model(size)
+        tree = MerkleTree(model)
+        drift(model, tree, device % 4)
+        fleet.append((model, tree))
+    gc.collect()
+    start = time.perf_counter()
+    drifted = {i for i, (_, tree) in enumerate(fleet) if tree != baseline}
+    report = {i: baseline.diff(fleet[i][1]) for i in drifted}
+    merkle = time.perf_counter() - start
+    start = time.perf_counter()
+    expected = golden.model_dump_json()
+    dumped = {
+        i for i, (model, _) in enumerate(fleet) if model.model_dump_json() != expected
+    }
+    json = time.perf_counter() - start
+    assert dumped == drifted
+    print(
+        f"fleet of {devices} x {size:,} interfaces: {len(drifted)} drifted, "
+        f"{sum(map(len, report.values()))} differences located in "
+        f"{merkle * 1e3:.1f} ms; model_dump_json comparison (detection only) "
+        f"{json * 1e3:.0f} ms"
+    )
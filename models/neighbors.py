@@ -0,0 +1,445 @@
+from __future__ import annotations
+
+import socket
+from enum import Enum
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+)
+
+import numpy as np
+from pydantic import BaseModel, ValidationError
+
+from models.adapters import list_adapter
+from models.ietf_interface import NeighborListEntry2, NeighborListEntry4
+from models.scanning import Structure, error_details, only_objects
+
+Entry = Union[NeighborListEntry2, NeighborListEntry4]
+
+CHUNK = 65_536
+"""
+Entries validated as objects at a time by `NeighborTable.validate_json`,
+bounding the memory used while loading.
+"""
+
+_MISSING = 255
+
+
+class NeighborView:
+    """
+    One entry of a `NeighborTable`, read from its columns on access.
+    """
+
+    __slots__ = ("position", "table")
+
+    def __init__(self, table: NeighborTable, position: int):
+        self.table = table
+        self.position = position
+
+    @property
+    def ip(self) -> str:
+        return self.table._ip(self.position)
+
+    @property
+    def link_layer_address(self) -> Optional[str]:
+        return self.table._link_layer_address(self.position)
+
+    @property
+    def origin(self) -> Optional[Enum]:
+        return self.table._member("origin", self.position)
+
+    @property
+    def is_router(self) -> bool:
+        return bool(self.table._is_router(self.position))
+
+    @property
+    def state(self) -> Optional[Enum]:
+        return self.table._member("state", self.position)
+
+    def model(self) -> Entry:
+        """
+        The entry as a model instance.
+        """
+        return self.table.entry(self.position)
+
+    def __repr__(self) -> str:
+        return (
+            f"NeighborView(ip={self.ip!r}, "
+            f"link_layer_address={self.link_layer_address!r}, "
+            f"origin={self.origin}, is_router={self.is_router}, state={self.state})"
+        )
+
+
+class NeighborTable:
+    """
+    An IPv6 neighbor list (`NeighborListEntry2` in config,
+    `NeighborListEntry4` in state) stored as columns instead of one model
+    instance per entry:
+
+    - `ip`: `(n, 16)` uint8, the 128-bit addresses in network order;
+    - `link_layer_address`: `(n, 6)` uint8, the 48-bit MAC addresses;
+    - `origin`, `state`: uint8 enumeration codes in member order, 255 when
+      absent;
+    - `is_router`: bitset of the entries with the `is-router` leaf.
+
+    Text that the columns do not reproduce exactly (zone indexes, addresses
+    not in RFC 5952 form, upper-case or non-48-bit MACs, absent MACs) is kept
+    as is in a small exception map, so every entry round-trips unchanged.
+    Indexing gives `NeighborView`s; `entry(i)` and `entries()` give model
+    instances. `keys()`, `text_ips` and `text_macs` are for vectorized
+    comparisons of whole tables, as `models.churn` makes.
+    """
+
+    def __init__(self, entry: Type[BaseModel] = NeighborListEntry4):
+        self.entry_type = entry
+        self.enums = {field: _type(entry, field) for field in ("origin", "state")}
+        self.is_router_type = _type(entry, "is_router")
+        self._members = {field: list(enum) for field, enum in self.enums.items()}
+        self.ip = np.zeros((0, 16), np.uint8)
+        self.link_layer_address = np.zeros((0, 6), np.uint8)
+        self.origin = np.zeros(0, np.uint8)
+        self.state = np.zeros(0, np.uint8)
+        self.is_router = np.zeros(0, np.uint8)
+        self._count = 0
+        self._ips: Dict[int, str] = {}
+        self._macs: Dict[int, Optional[str]] = {}
+        # The packed addresses in order, and their positions.
+        self._sorted: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    @classmethod
+    def from_entries(
+        cls, entries: Sequence[BaseModel], entry: Optional[Type[BaseModel]] = None
+    ) -> NeighborTable:
+        table = cls(entry or (type(entries[0]) if entries else NeighborListEntry4))
+        table._extend(entries)
+        return table
+
+    @classmethod
+    def validate_json(
+        cls, data: Union[str, bytes], entry: Type[BaseModel] = NeighborListEntry4
+    ) -> NeighborTable:
+        """
+        Validate the JSON array of a `ietf-ip:neighbor` list with the
+        `entry` model, `CHUNK` entries at a time, converting each chunk to
+        columns before validating the next. Errors are those of validating
+        the whole list at once.
+        """
+        table = cls(entry)
+        adapter = list_adapter(entry)
+        document = data.encode() if isinstance(data, str) else data
+        chunks = _chunks(document)
+        if chunks is None:
+            table._extend(adapter.validate_json(data))
+            return table
+        errors: List[Dict[str, Any]] = []
+        for first, chunk in chunks:
+            try:
+                validated = adapter.validate_json(chunk)
+            except ValidationError as error:
+                if any(e["type"] == "json_invalid" for e in error.errors()):
+                    # Offsets in the message would be relative to the chunk.
+                    return cls.from_entries(adapter.validate_json(data), entry)
+                errors.extend(
+                    error_details(e, (e["loc"][0] + first, *e["loc"][1:]))
+                    for e in error.errors()
+                )
+                continue
+            if not errors:
+                table._extend(validated)
+        if errors:
+            raise ValidationError.from_exception_data(
+                f"list[{entry.__name__}]", errors, input_type="json"
+            )
+        return table
+
+    def _extend(self, entries: Sequence[BaseModel]) -> None:
+        offset = self._count
+        ips, macs = [], []
+        origin_codes = _codes(self.enums["origin"])
+        state_codes = _codes(self.enums["state"])
+        # Filled as bytearrays: item assignment into numpy arrays is slower.
+        origins = bytearray([_MISSING]) * len(entries)
+        states = bytearray([_MISSING]) * len(entries)
+        routers = bytearray(len(entries))
+        for i, neighbor in enumerate(entries):
+            ips.append(_pack_ip(neighbor.ip, offset + i, self._ips))
+            macs.append(_pack_mac(neighbor.link_layer_address, offset + i, self._macs))
+            if neighbor.origin is not None:
+                origins[i] = origin_codes[neighbor.origin]
+            if neighbor.state is not None:
+                states[i] = state_codes[neighbor.state]
+            if neighbor.is_router is not None:
+                routers[i] = 1
+        self.ip = np.concatenate(
+            (self.ip, np.frombuffer(b"".join(ips), np.uint8).reshape(-1, 16))
+        )
+        self.link_layer_address = np.concatenate(
+            (
+                self.link_layer_address,
+                np.frombuffer(b"".join(macs), np.uint8).reshape(-1, 6),
+            )
+        )
+        self.origin = np.concatenate((self.origin, np.frombuffer(origins, np.uint8)))
+        self.state = np.concatenate((self.state, np.frombuffer(states, np.uint8)))
+        bits = np.unpackbits(self.is_router, count=self._count, bitorder="little")
+        self.is_router = np.packbits(
+            np.concatenate((bits, np.frombuffer(routers, np.uint8))), bitorder="little"
+        )
+        self._count += len(entries)
+        self._sorted = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: int) -> NeighborView:
+        if not -self._count <= position < self._count:
+            raise IndexError(f"neighbor {position} out of range")
+        return NeighborView(self, position % self._count)
+
+    def __iter__(self) -> Iterator[NeighborView]:
+        return (NeighborView(self, position) for position in range(self._count))
+
+    def get(self, ip: str) -> Optional[NeighborView]:
+        """
+        The entry for the address `ip`, or `None`, by binary search over the
+        address column. Addresses kept as text in the exception map only
+        match the same text.
+        """
+        try:
+            packed = socket.inet_pton(socket.AF_INET6, ip)
+        except OSError:
+            packed = None
+        if packed is None or socket.inet_ntop(socket.AF_INET6, packed) != ip:
+            position = next((p for p, t in self._ips.items() if t == ip), None)
+            return None if position is None else self[position]
+        if self._sorted is None:
+            keys = self.keys()
+            order = np.argsort(keys, kind="stable")
+            if self._ips:
+                # Their column rows are placeholders (`::`) or another
+                # spelling of the address.
+                order = order[~np.isin(order, list(self._ips))]
+            self._sorted = keys[order], order
+        keys, order = self._sorted
+        key = np.frombuffer(packed, keys.dtype)[0]
+        found = int(np.searchsorted(keys, key))
+        if found < len(keys) and keys[found] == key:
+            return self[int(order[found])]
+        return None
+
+    def keys(self) -> np.ndarray:
+        """
+        The `ip` column as one `V16` value per entry, which numpy sorts,
+        compares and intersects as whole addresses. The rows of `text_ips`
+        are placeholders.
+        """
+        return np.ascontiguousarray(self.ip).view(np.dtype("V16")).ravel()
+
+    @property
+    def text_ips(self) -> Mapping[int, str]:
+        """
+        Position -> `ip` of the entries whose address is kept as text.
+        """
+        return MappingProxyType(self._ips)
+
+    @property
+    def text_macs(self) -> Mapping[int, Optional[str]]:
+        """
+        Position -> `link-layer-address` (`None` when absent) of the entries
+        whose MAC address is kept as text.
+        """
+        return MappingProxyType(self._macs)
+
+    def entry(self, position: int) -> Entry:
+        view = self[position]
+        values = {"ip": view.ip}
+        for field in ("link_layer_address", "origin", "state"):
+            value = getattr(view, field)
+            if value is not None:
+                values[field] = value
+        if view.is_router:
+            values["is_router"] = self.is_router_type()
+        # Validated when the table was built.
+        return self.entry_type.model_construct(**values)
+
+    def entries(self) -> List[Entry]:
+        return [self.entry(position) for position in range(self._count)]
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by the columns.
+        """
+        return sum(
+            column.nbytes
+            for column in (
+                self.ip,
+                self.link_layer_address,
+                self.origin,
+                self.state,
+                self.is_router,
+            )
+        )
+
+    def _ip(self, position: int) -> str:
+        text = self._ips.get(position)
+        if text is not None:
+            return text
+        return socket.inet_ntop(socket.AF_INET6, self.ip[position].tobytes())
+
+    def _link_layer_address(self, position: int) -> Optional[str]:
+        if position in self._macs:
+            return self._macs[position]
+        return self.link_layer_address[position].tobytes().hex(":")
+
+    def _member(self, field: str, position: int) -> Optional[Enum]:
+        code = int(getattr(self, field)[position])
+        return None if code == _MISSING else self._members[field][code]
+
+    def _is_router(self, position: int) -> int:
+        return self.is_router[position >> 3] >> (position & 7) & 1
+
+
+def _type(entry: Type[BaseModel], field: str) -> Any:
+    annotation = entry.model_fields[field].annotation
+    return next(a for a in get_args(annotation) if a is not type(None))
+
+
+def _codes(enum: Type[Enum]) -> Dict[Any, int]:
+    codes: Dict[Any, int] = {}
+    for code, member in enumerate(enum):
+        # Compact models (`models.compact`) hold the string values.
+        codes[member] = codes[member.value] = code
+    return codes
+
+
+def _pack_ip(text: str, position: int, exceptions: Dict[int, str]) -> bytes:
+    try:
+        packed = socket.inet_pton(socket.AF_INET6, text)
+    except OSError:
+        exceptions[position] = text
+        return bytes(16)
+    if socket.inet_ntop(socket.AF_INET6, packed) != text:
+        exceptions[position] = text
+    return packed
+
+
+def _pack_mac(
+    text: Optional[str], position: int, exceptions: Dict[int, Optional[str]]
+) -> bytes:
+    if text is not None and len(text) == 17:
+        packed = bytes.fromhex(text.replace(":", ""))
+        if packed.hex(":") == text:
+            return packed
+    exceptions[position] = text
+    return bytes(6)
+
+
+def _chunks(document: bytes) -> Optional[List[Any]]:
+    """
+    `(first index, JSON array)` chunks of the top-level array `document`, or
+    `None` if it cannot be split safely.
+    """
+    structure = Structure(document)
+    if (
+        not len(structure.positions)
+        or structure.depths[-1] != 0
+        or structure.chars[0] != 91
+        or document[: structure.positions[0]].strip()
+        or document[structure.positions[-1] + 1 :].strip()
+    ):
+        return None
+    chars, depths = structure.chars, structure.depths
+    starts = structure.positions[(chars == 123) & (depths == 2)]
+    ends = structure.positions[(chars == 125) & (depths == 1)] + 1
+    opening, closing = int(structure.positions[0]), int(structure.positions[-1])
+    if len(starts) != len(ends) or not only_objects(
+        document, opening, closing, starts, ends
+    ):
+        return None
+    chunks = []
+    for first in range(0, len(starts), CHUNK):
+        last = min(first + CHUNK, len(starts)) - 1
+        chunks.append(
+            (first, b"".join((b"[", document[starts[first] : ends[last]], b"]")))
+        )
+    return chunks
+
+
+if __name__ == "__main__":
+    import gc
+    import json
+    import time
+    import tracemalloc
+
+    n = 500_000
+    states = ["reachable", "stale", "delay", "probe"]
+    document = json.dumps(
+        [
+            {
+                "ietf-ip:ip": socket.inet_ntop(
+                    socket.AF_INET6, (0xFE80 << 112 | 1 << 64 | i).to_bytes(16, "big")
+                ),
+                "ietf-ip:link-layer-address": (0x020000000000 | i)
+                .to_bytes(6, "big")
+                .hex(":"),
+                "ietf-ip:origin": "dynamic",
+                "ietf-ip:state": states[i % 4],
+                **({"ietf-ip:is-router": {}} if i % 100 == 0 else {}),
+            }
+            for i in range(n)
+        ]
+    ).encode()
+    print(f"{n:,} neighbors, {len(document) / 2**20:.0f} MiB of JSON")
+
+    def measure(label: str, function: Any) -> Any:
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        tracemalloc.start()
+        result = function()
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{label:<28} {elapsed:6.2f} s, {retained / 2**20:7.1f} MiB retained, "
+            f"{peak / 2**20:7.1f} MiB peak"
+        )
+        return result
+
+    objects = measure(
+        "list[NeighborListEntry4]",
+        lambda: list_adapter(NeighborListEntry4).validate_json(document),
+    )
+    table = measure("NeighborTable", lambda: NeighborTable.validate_json(document))
+    assert table.entries() == objects
+    print(f"{'':<28} columns {table.nbytes / 2**20:.1f} MiB")
+
+    probes = [objects[i].ip for i in range(0, n, 997)]
+    start = time.perf_counter()
+    states = [table.get(ip).state for ip in probes]
+    elapsed = time.perf_counter() - start
+    assert states == [objects[i].state for i in range(0, n, 997)]
+    print(f"get(ip).state: {elapsed / len(probes) * 1e6:.1f} us per lookup")
+
+    # Exception rows hold `::` or another spelling in the address column.
+    spelled = ["fe80::1%eth0", "2001:DB8::1", "2001:db8::2"]
+    small = NeighborTable.from_entries(
+        [NeighborListEntry4(ip=ip) for ip in spelled], NeighborListEntry4
+    )
+    assert small.get("::") is None and small.get("2001:db8::1") is None
+    assert [small.get(ip).position for ip in spelled] == [0, 1, 2]
+    small._extend([NeighborListEntry4(ip="::")])
+    assert small.get("::").position == 3
@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+from urllib.parse import unquote
+
+from pydantic import BaseModel
+
+from models.ietf_interface import Model
+
+
+class Step(NamedTuple):
+    attr: str
+    key: Optional[str]
+    """
+    Key value selecting one list entry, `None` for containers, leaves and
+    whole lists.
+    """
+    key_attr: Optional[str]
+
+
+class InstancePath(NamedTuple):
+    path: str
+    steps: Tuple[Step, ...]
+    leaf: bool
+    """
+    Whether the path ends at a leaf or leaf-list.
+    """
+
+
+class PathSyntaxError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=4096)
+def compile_path(path: str, model: Type[BaseModel] = Model) -> InstancePath:
+    """
+    Compile a RESTCONF data resource identifier (RFC 8040, 3.5.3) such as
+    `/ietf-interfaces:interfaces/interface=eth1/ietf-ip:ipv4/address=10.0.0.1`
+    against `model`.
+
+    Module prefixes are optional; when given they must match the module of
+    the node. Key values are percent-decoded, so `interface=Ethernet1%2F1`
+    selects `Ethernet1/1`.
+    """
+    cls: Optional[Type[BaseModel]] = model
+    steps = []
+    for segment in path.strip("/").split("/"):
+        if cls is None:
+            raise PathSyntaxError(f"{path!r} continues below a leaf")
+        identifier, _, key = segment.partition("=")
+        prefix, _, name = identifier.rpartition(":")
+        node = _nodes(cls).get(name)
+        if node is None:
+            raise PathSyntaxError(f"{cls.__name__} has no node {name!r} in {path!r}")
+        if prefix and prefix != node.module:
+            raise PathSyntaxError(
+                f"{name!r} is in module {node.module!r}, not {prefix!r}"
+            )
+        if "=" in segment:
+            if node.entry is None:
+                raise PathSyntaxError(f"{name!r} is not a list in {path!r}")
+            steps.append(Step(node.attr, unquote(key), node.key_attr))
+            cls = node.entry
+        else:
+            steps.append(Step(node.attr, None, None))
+            cls = node.container
+    return InstancePath(path, tuple(steps), cls is None)
+
+
+class _Node(NamedTuple):
+    attr: str
+    module: str
+    container: Optional[Type[BaseModel]]
+    entry: Optional[Type[BaseModel]]
+    key_attr: Optional[str]
+
+
+@lru_cache(maxsize=None)
+def _nodes(cls: Type[BaseModel]) -> Dict[str, _Node]:
+    """
+    YANG identifier -> schema information for the children of `cls`.
+    """
+    nodes = {}
+    for attr, info in cls.model_fields.items():
+        module, _, name = (info.alias or attr).rpartition(":")
+        annotation = _unwrap(info.annotation)
+        entry = _list_entry(annotation)
+        nodes[name] = _Node(
+            attr,
+            module,
+            annotation if _is_model(annotation) else None,
+            entry,
+            next(iter(entry.model_fields)) if entry else None,
+        )
+    return nodes
+
+
+def _unwrap(annotation: Any) -> Any:
+    arguments = [a for a in get_args(annotation) if a is not type(None)]
+    if get_origin(annotation) is Union and len(arguments) == 1:
+        return arguments[0]
+    return annotation
+
+
+def _list_entry(annotation: Any) -> Optional[Type[BaseModel]]:
+    """
+    Entry class of a list; `None` for anything else, including leaf-lists.
+    """
+    if get_origin(annotation) is list and _is_model(get_args(annotation)[0]):
+        return get_args(annotation)[0]
+    return None
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+class PathResolver:
+    """
+    Resolves compiled instance identifiers against one model in O(depth).
+
+    List entries are found through key -> position indexes built per list on
+    first use. An index is kept in sync by `set()`/`delete()`; for lists
+    changed directly it notices length changes and entries whose key no
+    longer matches, otherwise call `invalidate()`.
+    """
+
+    def __init__(self, model: BaseModel):
+        self.model = model
+        self._indexes: Dict[int, Tuple[List[Any], Dict[str, int]]] = {}
+
+    def invalidate(self) -> None:
+        self._indexes.clear()
+
+    def get(self, path: Union[str, InstancePath]) -> Any:
+        instance = self._compile(path)
+        node = self.model
+        for step in instance.steps:
+            node = self._step(node, step, instance)
+        return node
+
+    def set(self, path: Union[str, InstancePath], value: Any) -> None:
+        """
+        Create or replace the node at `path`, validating `value` against the
+        node's schema. The parent node must exist.
+        """
+        instance = self._compile(path)
+        parent, step = self._parent(instance)
+        if step.key is None:
+            parent.__pydantic_validator__.validate_assignment(parent, step.attr, value)
+            return
+        items = getattr(parent, step.attr)
+        entry_cls = _list_entry(
+            _unwrap(type(parent).model_fields[step.attr].annotation)
+        )
+        entry = entry_cls.model_validate(value)
+        if getattr(entry, step.key_attr) != step.key:
+            raise ValueError(
+                f"{step.key_attr} {getattr(entry, step.key_attr)!r} does not match "
+                f"the key {step.key!r} in {instance.path!r}"
+            )
+        if items is None:
+            parent.__pydantic_validator__.validate_assignment(
+                parent, step.attr, [entry]
+            )
+            return
+        position = self._find(items, step)
+        if position is None:
+            items.append(entry)
+            self._index(items, step)[step.key] = len(items) - 1
+        else:
+            items[position] = entry
+
+    def delete(self, path: Union[str, InstancePath]) -> None:
+        """
+        Remove the list entry at `path`, or reset the leaf or container at
+        `path` to its default.
+        """
+        instance = self._compile(path)
+        parent, step = self._parent(instance)
+        if step.key is not None:
+            items = getattr(parent, step.attr) or []
+            position = self._find(items, step)
+            if position is None:
+                raise KeyError(f"{instance.path!r}: no {step.attr} entry {step.key!r}")
+            del items[position]
+            self._indexes.pop(id(items), None)
+            return
+        field = type(parent).model_fields[step.attr]
+        if field.is_required():
+            raise ValueError(f"{instance.path!r} is mandatory")
+        parent.__dict__[step.attr] = field.get_default(call_default_factory=True)
+        parent.__pydantic_fields_set__.discard(step.attr)
+
+    def parent(self, path: Union[str, InstancePath]) -> Tuple[BaseModel, Step]:
+        """
+        The node holding the last step of `path`, and that step.
+        """
+        return self._parent(self._compile(path))
+
+    def _compile(self, path: Union[str, InstancePath]) -> InstancePath:
+        if isinstance(path, InstancePath):
+            return path
+        return compile_path(path, type(self.model))
+
+    def _parent(self, instance: InstancePath) -> Tuple[BaseModel, Step]:
+        node = self.model
+        for step in instance.steps[:-1]:
+            node = self._step(node, step, instance)
+        return node, instance.steps[-1]
+
+    def _step(self, node: Any, step: Step, instance: InstancePath) -> Any:
+        value = getattr(node, step.attr)
+        if value is None:
+            raise KeyError(f"{instance.path!r}: {step.attr} is not present")
+        if step.key is None:
+            return value
+        position = self._find(value, step)
+        if position is None:
+            raise KeyError(f"{instance.path!r}: no {step.attr} entry {step.key!r}")
+        return value[position]
+
+    def _find(self, items: List[Any], step: Step) -> Optional[int]:
+        index = self._index(items, step)
+        position = index.get(step.key)
+        if position is None:
+            if len(index) == len(items):
+                return None
+        elif (
+            position < len(items)
+            and getattr(items[position], step.key_attr) == step.key
+        ):
+            return position
+        # The list was changed behind our back.
+        return self._index(items, step, rebuild=True).get(step.key)
+
+    def _index(
+        self, items: List[Any], step: Step, rebuild: bool = False
+    ) -> Dict[str, int]:
+        cached = self._indexes.get(id(items))
+        if cached is None or cached[0] is not items or rebuild:
+            index = {
+                getattr(item, step.key_attr): position
+                for position, item in enumerate(items)
+            }
+            cached = self._indexes[id(items)] = (items, index)
+        return cached[1]
+
+
+if __name__ == "__main__":
+    import gc
+    import random
+    import time
+
+    from models import synthetic
+    from models.query import select
+
+    n, neighbors, lookups = 10_000, 4, 1_000_000
+    model = synthetic.model(n, neighbors)
+    resolver = PathResolver(model)
+    names = [entry.name for entry in model.interfaces_state.interface]
+    rng = random.Random(0)
+
+    def path(i: int) -> str:
+        name = names[i]
+        kind = i % 3
+        if kind == 0:
+            return (
+                f"/ietf-interfaces:interfaces-state/interface={name}"
+                "/statistics/in-octets"
+            )
+        if kind == 1:
+            return (
+                f"/ietf-interfaces:interfaces/interface={name}"
+                f"/ietf-ip:ipv4/address={synthetic._ipv4(i)}"
+            )
+        return (
+            f"/ietf-interfaces:interfaces-state/interface={name}/ietf-ip:ipv6"
+            f"/neighbor={synthetic._ipv6('fe80:', (i + 1) * neighbors - 1)}"
+            "/link-layer-address"
+        )
+
+    paths = [path(rng.randrange(n)) for _ in range(1_000)]
+    compiled = [compile_path(p) for p in paths]
+    for p in paths:
+        resolver.get(p)
+    gc.collect()
+
+    def bench(label: str, count: int, lookup: Any) -> None:
+        start = time.perf_counter()
+        for i in range(count):
+            lookup(i % len(paths))
+        elapsed = time.perf_counter() - start
+        print(f"{label:<36} {count:>9,} lookups {elapsed / count * 1e6:7.2f} us each")
+
+    bench("compiled InstancePath", lookups, lambda i: resolver.get(compiled[i]))
+    bench("path string (compile cache)", lookups, lambda i: resolver.get(paths[i]))
+
+    def scan(i: int) -> Any:
+        name = compiled[i].steps[1].key
+        return select(model, f"/interfaces-state/interface[name='{name}']/statistics")
+
+    bench("query.select list scan", 200, scan)
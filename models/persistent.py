@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import Any, List, Sequence, TypeVar, Union
+
+from pydantic import BaseModel
+
+Node = TypeVar("Node", bound=BaseModel)
+Step = Union[str, int]
+
+
+def replace(node: Node, **changes: Any) -> Node:
+    """
+    Shallow copy of `node` with `changes` validated and applied.
+
+    Children that are not changed are shared with `node`, not copied.
+    """
+    copy = node.__class__.__new__(node.__class__)
+    object.__setattr__(copy, "__dict__", dict(node.__dict__))
+    object.__setattr__(copy, "__pydantic_fields_set__", set(node.model_fields_set))
+    object.__setattr__(copy, "__pydantic_extra__", None)
+    object.__setattr__(copy, "__pydantic_private__", None)
+    for field, value in changes.items():
+        node.__pydantic_validator__.validate_assignment(copy, field, value)
+    return copy
+
+
+def evolve(root: Node, path: Sequence[Step], **changes: Any) -> Node:
+    """
+    New version of `root` with `changes` applied to the node at `path`.
+
+    Only the nodes on the path from the changed node up to the root are
+    copied (lists on the path are copied as lists of references); every other
+    subtree is shared between `root` and the result, so a variant that
+    touches one interface costs a handful of nodes plus one pointer array
+    instead of a full `model_copy(deep=True)`.
+
+    `path` consists of attribute names and, for lists, either a position or
+    the value of the entry's key leaf (`name` for interfaces, `ip` for
+    addresses and neighbors), e.g. `("interfaces", "interface", "eth3",
+    "ipv4")`.
+
+    Because subtrees are shared, nodes reachable from a versioned model must
+    not be mutated in place; derive new versions with `evolve()` instead.
+    """
+    nodes: List[Any] = [root]
+    for step in path:
+        nodes.append(_child(nodes[-1], step))
+    if not isinstance(nodes[-1], BaseModel):
+        raise TypeError(f"{_format(path)} is not a container or list entry")
+    node = replace(nodes[-1], **changes)
+    for parent, step in zip(reversed(nodes[:-1]), reversed(path)):
+        if isinstance(parent, list):
+            items = list(parent)
+            items[_position(parent, step)] = node
+            node = items
+        else:
+            node = _attach(parent, step, node)
+    return node
+
+
+def _child(node: Any, step: Step) -> Any:
+    if isinstance(node, list):
+        return node[_position(node, step)]
+    if node is None or not isinstance(step, str) or step not in type(node).model_fields:
+        raise KeyError(f"no node {step!r} in {type(node).__name__}")
+    return getattr(node, step)
+
+
+def _position(items: List[Any], step: Step) -> int:
+    if isinstance(step, int):
+        if not -len(items) <= step < len(items):
+            raise IndexError(f"list entry {step} out of range")
+        return step % len(items)
+    for position, item in enumerate(items):
+        if getattr(item, _key(item)) == step:
+            return position
+    raise KeyError(f"no list entry {step!r}")
+
+
+def _key(entry: BaseModel) -> str:
+    # pydantify emits the list key leaf first.
+    return next(iter(entry.__class__.model_fields))
+
+
+def _attach(parent: Node, field: str, child: Any) -> Node:
+    """
+    Copy of `parent` pointing at the new `child`. The child was built from
+    validated parts, so it is assigned without validating it again.
+    """
+    copy = replace(parent)
+    copy.__dict__[field] = child
+    copy.__pydantic_fields_set__.add(field)
+    return copy
+
+
+def _format(path: Sequence[Step]) -> str:
+    return "/".join(str(step) for step in path) or "/"
+
+
+if __name__ == "__main__":
+    import gc
+    import time
+    import tracemalloc
+
+    from models import synthetic
+    from models.ietf_interface import Model
+
+    n, count = 10_000, 100
+    base = Model.model_validate(
+        {"ietf-interfaces:interfaces": synthetic.config_payload(n)}
+    )
+    names = [entry.name for entry in base.interfaces.interface]
+    gc.collect()
+
+    def variants(make: Any, sample: int) -> None:
+        """
+        Time and trace `sample` variants and scale both to `count`;
+        tracemalloc slows the object-heavy deep copies down a lot.
+        """
+        start = time.perf_counter()
+        result = [make(i) for i in range(sample)]
+        elapsed = time.perf_counter() - start
+        del result
+        tracemalloc.start()
+        result = [make(i) for i in range(sample)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del result
+        scale = count / sample
+        print(
+            f"{count} variants of {n} interfaces, {make.__name__:<10}: "
+            f"{size * scale / 2**20:8.1f} MiB, {elapsed * scale:6.2f} s"
+            + (f" (extrapolated from {sample})" if sample < count else "")
+        )
+
+    def deep_copy(i: int) -> BaseModel:
+        variant = base.model_copy(deep=True)
+        entry = variant.interfaces.interface[i]
+        entry.description = f"site {i}"
+        entry.ipv4.mtu = 9000
+        return variant
+
+    def evolved(i: int) -> BaseModel:
+        path = ("interfaces", "interface", names[i])
+        variant = evolve(base, path, description=f"site {i}")
+        return evolve(variant, (*path, "ipv4"), mtu=9000)
+
+    variants(evolved, count)
+    variants(deep_copy, 5)
+    assert evolved(7) == deep_copy(7) != base
@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import gc
+import socket
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from models.ietf_interface import AddressListEntry, AddressListEntry2, Model
+from models.interface_stack import model_interfaces
+
+Address = Union[AddressListEntry, AddressListEntry2]
+
+_WIDTHS = {socket.AF_INET: 32, socket.AF_INET6: 128}
+
+
+class Owner(NamedTuple):
+    """
+    One configured address: `ip` as configured and its prefix length, with
+    a netmask normalized to a length; `None` when the entry has no subnet.
+    """
+
+    device: str
+    interface: str
+    ip: str
+    prefix_length: Optional[int]
+
+
+class Overlap(NamedTuple):
+    """
+    Two addresses on different interfaces whose subnets overlap: `inner`'s
+    subnet lies within `outer`'s, or both are the same subnet.
+    """
+
+    outer: Owner
+    inner: Owner
+
+
+class _Node:
+    """
+    A node of a path-compressed binary trie: the prefix `key`/`length` and
+    the owners configured exactly there.
+    """
+
+    __slots__ = ("children", "key", "length", "owners")
+
+    def __init__(self, key: int, length: int) -> None:
+        self.key = key
+        self.length = length
+        self.children: List[Optional[_Node]] = [None, None]
+        self.owners: List[Owner] = []
+
+
+class _Trie:
+    def __init__(self, width: int) -> None:
+        self.width = width
+        self.root = _Node(0, 0)
+
+    def insert(self, key: int, length: int, owner: Owner) -> None:
+        width = self.width
+        node = self.root
+        while node.length != length:
+            bit = key >> (width - 1 - node.length) & 1
+            child = node.children[bit]
+            if child is None:
+                child = node.children[bit] = _Node(key, length)
+                break
+            common = min(length, child.length, width - (key ^ child.key).bit_length())
+            if common == child.length:
+                node = child
+                continue
+            # `child` diverges from `key` below `common`: splice a node there.
+            split = _Node(key >> (width - common) << (width - common), common)
+            split.children[child.key >> (width - 1 - common) & 1] = child
+            node.children[bit] = split
+            if common != length:
+                child = split.children[key >> (width - 1 - common) & 1] = _Node(
+                    key, length
+                )
+                break
+            node = split
+        else:
+            child = node
+        child.owners.append(owner)
+
+    def path(self, key: int, length: int) -> Tuple[List[_Node], Optional[_Node]]:
+        """
+        The nodes with owners whose prefixes strictly contain `key`/`length`,
+        shortest first, and the subtree of the prefixes within it (itself
+        included), if any.
+        """
+        width = self.width
+        node = self.root
+        found = []
+        while node.length < length:
+            if node.owners:
+                found.append(node)
+            child = node.children[key >> (width - 1 - node.length) & 1]
+            if child is None:
+                return found, None
+            if (key ^ child.key) >> (width - min(child.length, length)):
+                # `child` and `key`/`length` are disjoint.
+                return found, None
+            node = child
+        return found, node
+
+    def longest(self, key: int) -> Optional[_Node]:
+        found, below = self.path(key, self.width)
+        if below is not None and below.owners:
+            return below
+        return found[-1] if found else None
+
+
+def _subtree(node: _Node) -> Iterable[_Node]:
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.owners:
+            yield node
+        stack.extend(child for child in reversed(node.children) if child is not None)
+
+
+def _parse(ip: str) -> Tuple[int, int]:
+    """
+    Family and integer value of an address, without its zone (`%eth0`).
+    """
+    text = ip.partition("%")[0]
+    family = socket.AF_INET6 if ":" in text else socket.AF_INET
+    return family, int.from_bytes(socket.inet_pton(family, text), "big")
+
+
+def _prefix(text: str) -> Tuple[int, int, int]:
+    ip, _, length = text.partition("/")
+    family, value = _parse(ip)
+    width = _WIDTHS[family]
+    bits = int(length) if length else width
+    if not 0 <= bits <= width:
+        raise ValueError(f"prefix length out of range in {text!r}")
+    return family, value >> (width - bits) << (width - bits), bits
+
+
+def prefix_length(address: Address) -> Optional[int]:
+    """
+    The prefix length of a configured address, converting an IPv4 `netmask`;
+    `None` when the entry has no subnet. Raises `ValueError` for a
+    non-contiguous netmask.
+    """
+    if isinstance(address, AddressListEntry2):
+        return address.prefix_length
+    subnet = address.subnet
+    length = getattr(subnet, "prefix_length", None)
+    netmask = getattr(subnet, "netmask", None)
+    if length is not None or netmask is None:
+        return length
+    mask = int.from_bytes(socket.inet_aton(netmask), "big")
+    length = 32 - (~mask & 0xFFFFFFFF).bit_length()
+    if mask != 0xFFFFFFFF >> (32 - length) << (32 - length):
+        raise ValueError(f"non-contiguous netmask {netmask!r}")
+    return length
+
+
+class PrefixIndex:
+    """
+    The configured IPv4 and IPv6 addresses (`interfaces` `ipv4`/`ipv6`
+    `address` lists) of one or many devices, indexed for subnet queries.
+
+    Each family has two path-compressed binary tries: one of subnets, each
+    address stored at its network prefix, and one of the addresses
+    themselves. A query walks one path from the root, so it visits at most
+    32 (IPv4) or 128 (IPv6) nodes however many prefixes are indexed, plus
+    the answers.
+    """
+
+    def __init__(self) -> None:
+        self._subnets = {family: _Trie(width) for family, width in _WIDTHS.items()}
+        self._addresses = {family: _Trie(width) for family, width in _WIDTHS.items()}
+        self._size = 0
+
+    @classmethod
+    def from_models(cls, models: Union[Model, Mapping[str, Model]]) -> PrefixIndex:
+        """
+        Index one `Model` (as device `""`) or a mapping of device names to
+        models.
+        """
+        index = cls()
+        if isinstance(models, Model):
+            models = {"": models}
+        for device, model in models.items():
+            index.add(device, model)
+        return index
+
+    def add(self, device: str, model: Model) -> None:
+        enabled = gc.isenabled()
+        # The tries are acyclic; collections while growing them only cost time.
+        gc.disable()
+        try:
+            for entry in model_interfaces(model):
+                for family in (entry.ipv4, entry.ipv6):
+                    if family is not None:
+                        self._add(device, entry.name, family.address or ())
+        finally:
+            if enabled:
+                gc.enable()
+
+    def _add(self, device: str, interface: str, addresses: Iterable[Address]) -> None:
+        for address in addresses:
+            length = prefix_length(address)
+            owner = Owner(device, interface, address.ip, length)
+            family, value = _parse(address.ip)
+            width = _WIDTHS[family]
+            self._addresses[family].insert(value, width, owner)
+            if length is not None:
+                network = value >> (width - length) << (width - length)
+                self._subnets[family].insert(network, length, owner)
+            self._size += 1
+
+    def longest_match(self, ip: str) -> List[Owner]:
+        """
+        Owners of the longest configured subnet containing `ip`, e.g. the
+        interfaces `ip` is directly reachable through; empty when none does.
+        """
+        family, value = _parse(ip)
+        node = self._subnets[family].longest(value)
+        return list(node.owners) if node is not None else []
+
+    def owners(self, ip: str) -> List[Owner]:
+        """
+        Everywhere the address `ip` is configured, whatever the prefix length.
+        """
+        family, value = _parse(ip)
+        _, node = self._addresses[family].path(value, _WIDTHS[family])
+        return list(node.owners) if node is not None else []
+
+    def overlapping(self, prefix: str) -> List[Owner]:
+        """
+        Owners of the configured subnets that overlap `prefix` (an address,
+        or `address/length`): those containing it, then those within it.
+        """
+        family, key, length = _prefix(prefix)
+        found, below = self._subnets[family].path(key, length)
+        owners = [owner for node in found for owner in node.owners]
+        if below is not None:
+            owners.extend(owner for node in _subtree(below) for owner in node.owners)
+        return owners
+
+    def overlaps(self) -> List[Overlap]:
+        """
+        Every pair of addresses on different interfaces (or devices) whose
+        subnets overlap. The two ends of a point-to-point link share their
+        subnet, so filter by `device` for conflicts within one device.
+        """
+        overlaps: List[Overlap] = []
+        for trie in self._subnets.values():
+            stack: List[Tuple[_Node, List[Owner]]] = [(trie.root, [])]
+            while stack:
+                node, above = stack.pop()
+                owners = node.owners
+                if owners:
+                    for inner in owners:
+                        overlaps.extend(
+                            Overlap(outer, inner)
+                            for outer in above
+                            if _interface(outer) != _interface(inner)
+                        )
+                    overlaps.extend(
+                        Overlap(outer, inner)
+                        for k, inner in enumerate(owners)
+                        for outer in owners[:k]
+                        if _interface(outer) != _interface(inner)
+                    )
+                    above = above + owners
+                stack.extend(
+                    (child, above) for child in node.children if child is not None
+                )
+        return overlaps
+
+    def duplicates(self) -> Dict[str, List[Owner]]:
+        """
+        Addresses configured on more than one interface, by address as first
+        configured.
+        """
+        duplicates = {}
+        for trie in self._addresses.values():
+            for node in _subtree(trie.root):
+                if len({_interface(owner) for owner in node.owners}) > 1:
+                    duplicates[node.owners[0].ip] = list(node.owners)
+        return duplicates
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def _interface(owner: Owner) -> Tuple[str, str]:
+    return owner.device, owner.interface
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    from ipaddress import ip_address, ip_network
+
+    from models import synthetic
+
+    devices, n, lookups = 200, 500, 100_000
+    model = synthetic.model(n)
+    models = {}
+    for device in range(devices):
+        copy = model.model_copy(deep=True)
+        for i, entry in enumerate(copy.interfaces.interface):
+            # A /31 per interface, unique across the fleet.
+            address = entry.ipv4.address[0]
+            address.ip = str(ip_address("10.0.0.0") + 2 * (device * n + i))
+        models[f"device{device}"] = copy
+    # A few mistakes to find: a reused address and a covering subnet.
+    duplicate = models["device1"].interfaces.interface[3].ipv4.address[0]
+    duplicate.ip = models["device0"].interfaces.interface[3].ipv4.address[0].ip
+    covering = models["device2"].interfaces.interface[4].ipv4.address[0]
+    covering.subnet.prefix_length = 24
+    gc.collect()
+
+    start = time.perf_counter()
+    index = PrefixIndex.from_models(models)
+    elapsed = time.perf_counter() - start
+    print(f"index {len(index):,} addresses of {devices} devices: {elapsed:.2f} s")
+
+    rng = random.Random(0)
+    targets = [
+        str(ip_address("10.0.0.0") + rng.randrange(2 * devices * n))
+        for _ in range(lookups)
+    ]
+    start = time.perf_counter()
+    matched = sum(1 for ip in targets if index.longest_match(ip))
+    elapsed = time.perf_counter() - start
+    print(
+        f"longest_match(): {elapsed / lookups * 1e6:.1f} us per lookup "
+        f"({matched:,} of {lookups:,} matched)"
+    )
+
+    networks = [
+        ip_network(f"{address.ip}/{prefix_length(address)}", strict=False)
+        for model_ in models.values()
+        for entry in model_.interfaces.interface
+        for address in entry.ipv4.address
+    ]
+    start = time.perf_counter()
+    for ip in targets[:100]:
+        address = ip_address(ip)
+        max(
+            (network.prefixlen for network in networks if address in network),
+            default=None,
+        )
+    elapsed = time.perf_counter() - start
+    print(f"linear scan baseline: {elapsed / 100 * 1e6:.1f} us per lookup")
+
+    start = time.perf_counter()
+    overlaps = index.overlaps()
+    duplicates = index.duplicates()
+    elapsed = time.perf_counter() - start
+    print(
+        f"overlaps() and duplicates(): {elapsed * 1000:.0f} ms, "
+        f"{len(overlaps)} overlaps, {len(duplicates)} duplicate addresses"
+    )
+    assert list(duplicates) == [duplicate.ip]
+    # The /24 covers 127 other /31s; the reused address shares its /31.
+    assert len(overlaps) == 128
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import copy
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, create_model
+
+from models.ietf_interface import Model
+
+Fields = Dict[str, Optional["Fields"]]
+"""
+Parsed `fields=` expression: YANG identifier -> selected children, `None`
+selecting the whole subtree.
+"""
+
+
+class FieldsSyntaxError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=256)
+def parse_fields(expression: str) -> Fields:
+    """
+    Parse a RESTCONF `fields` query parameter (RFC 8040, 4.8.3), e.g.
+    `interfaces-state/interface(name;oper-status;statistics/in-octets)`.
+
+    Identifiers may carry a module prefix, which is ignored.
+    """
+    fields, end = _parse(expression.replace(" ", ""), 0)
+    if end != len(expression.replace(" ", "")):
+        raise FieldsSyntaxError(f"unexpected ')' at {end} in {expression!r}")
+    return fields
+
+
+def _parse(text: str, position: int) -> Tuple[Fields, int]:
+    fields: Fields = {}
+    while True:
+        start = position
+        while position < len(text) and text[position] not in "();":
+            position += 1
+        path = text[start:position].split("/")
+        if not all(path):
+            raise FieldsSyntaxError(f"empty identifier at {start} in {text!r}")
+        children = None
+        if position < len(text) and text[position] == "(":
+            children, position = _parse(text, position + 1)
+            if position >= len(text) or text[position] != ")":
+                raise FieldsSyntaxError(f"missing ')' in {text!r}")
+            position += 1
+        for name in reversed(path[1:]):
+            children = {_local(name): children}
+        _merge(fields, _local(path[0]), children)
+        if position < len(text) and text[position] == ";":
+            position += 1
+            continue
+        return fields, position
+
+
+def _local(name: str) -> str:
+    return name.rsplit(":", 1)[-1]
+
+
+def _merge(fields: Fields, name: str, children: Optional[Fields]) -> None:
+    if name not in fields:
+        fields[name] = children
+    elif fields[name] is None or children is None:
+        fields[name] = None
+    else:
+        for child, grandchildren in children.items():
+            _merge(fields[name], child, grandchildren)
+
+
+def _attributes(cls: Type[BaseModel]) -> Dict[str, str]:
+    return {_local(info.alias or attr): attr for attr, info in cls.model_fields.items()}
+
+
+def _freeze(fields: Optional[Fields]) -> Any:
+    if fields is None:
+        return None
+    return tuple(sorted((name, _freeze(children)) for name, children in fields.items()))
+
+
+def _thaw(frozen: Any) -> Optional[Fields]:
+    if frozen is None:
+        return None
+    return {name: _thaw(children) for name, children in frozen}
+
+
+def projection(cls: Type[BaseModel], fields: Union[str, Fields]) -> Type[BaseModel]:
+    """
+    A model class containing only the selected nodes of `cls`.
+
+    Validating a document with it skips every other subtree: pydantic ignores
+    the unknown keys, so no Python objects are created for them, and
+    required leaves outside the selection are not required. Selected leaves
+    keep their constraints, aliases and configuration. Classes are cached
+    per selection.
+    """
+    if isinstance(fields, str):
+        fields = parse_fields(fields)
+    return _projection(cls, _freeze(fields))
+
+
+@lru_cache(maxsize=None)
+def _projection(cls: Type[BaseModel], frozen: Any) -> Type[BaseModel]:
+    fields = _thaw(frozen)
+    if fields is None:
+        return cls
+    attributes = _attributes(cls)
+    definitions = {}
+    for name, children in fields.items():
+        if name not in attributes:
+            raise FieldsSyntaxError(f"{cls.__name__} has no node {name!r}")
+        attr = attributes[name]
+        info = copy.copy(cls.model_fields[attr])
+        annotation = _annotation(info.annotation, children, name)
+        info.annotation = annotation
+        definitions[attr] = (annotation, info)
+    return create_model(
+        f"{cls.__name__}Projection",
+        __config__=cls.model_config,
+        __module__=__name__,
+        **definitions,
+    )
+
+
+def _annotation(annotation: Any, children: Optional[Fields], name: str) -> Any:
+    if children is None or annotation is type(None):
+        return annotation
+    if _is_model(annotation):
+        return _projection(annotation, _freeze(children))
+    arguments = get_args(annotation)
+    if get_origin(annotation) is list:
+        return List[_annotation(arguments[0], children, name)]
+    if get_origin(annotation) is Union:
+        return Union[
+            tuple(
+                _annotation(argument, selected, name)
+                for argument, selected in _cases(arguments, children, name)
+            )
+        ]
+    raise FieldsSyntaxError(f"{name!r} is a leaf and has no child nodes")
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _cases(
+    arguments: Tuple[Any, ...], children: Fields, name: str
+) -> List[Tuple[Any, Fields]]:
+    """
+    Split the selection over the members of a union. For a choice between
+    several case models (`subnet`), each case keeps the selected nodes it
+    actually has.
+    """
+    models = [argument for argument in arguments if _is_model(argument)]
+    if len(models) < 2:
+        return [(argument, children) for argument in arguments]
+    known = set().union(*(_attributes(model) for model in models))
+    unknown = sorted(children.keys() - known)
+    if unknown:
+        raise FieldsSyntaxError(f"{name!r} has no node {unknown[0]!r}")
+    return [
+        (
+            argument,
+            {k: v for k, v in children.items() if k in _attributes(argument)}
+            if _is_model(argument)
+            else children,
+        )
+        for argument in arguments
+    ]
+
+
+def include(cls: Type[BaseModel], fields: Union[str, Fields]) -> Any:
+    """
+    `model_dump(include=...)` specification limiting serialization of a
+    `cls` instance to the selected nodes.
+    """
+    if isinstance(fields, str):
+        fields = parse_fields(fields)
+    return _include(cls, _freeze(fields))
+
+
+@lru_cache(maxsize=None)
+def _include(cls: Type[BaseModel], frozen: Any) -> Any:
+    fields = _thaw(frozen)
+    attributes = _attributes(cls)
+    spec: Dict[str, Any] = {}
+    for name, children in fields.items():
+        if name not in attributes:
+            raise FieldsSyntaxError(f"{cls.__name__} has no node {name!r}")
+        attr = attributes[name]
+        spec[attr] = _include_annotation(
+            cls.model_fields[attr].annotation, children, name
+        )
+    return spec
+
+
+def _include_annotation(annotation: Any, children: Optional[Fields], name: str) -> Any:
+    if children is None or annotation is type(None):
+        return True
+    if _is_model(annotation):
+        return _include(annotation, _freeze(children))
+    arguments = get_args(annotation)
+    if get_origin(annotation) is list:
+        return {"__all__": _include_annotation(arguments[0], children, name)}
+    if get_origin(annotation) is Union:
+        spec: Dict[str, Any] = {}
+        for argument, selected in _cases(arguments, children, name):
+            if argument is not type(None):
+                spec.update(_include_annotation(argument, selected, name))
+        return spec
+    raise FieldsSyntaxError(f"{name!r} is a leaf and has no child nodes")
+
+
+def validate_json(
+    data: Union[str, bytes], fields: Union[str, Fields], model: Type[BaseModel] = Model
+) -> BaseModel:
+    """
+    Decode only the selected nodes of a JSON document.
+    """
+    return projection(model, fields).model_validate_json(data)
+
+
+def dump(instance: BaseModel, fields: Union[str, Fields], **options: Any) -> Any:
+    """
+    `model_dump()` of the selected nodes only.
+    """
+    return instance.model_dump(include=include(type(instance), fields), **options)
+
+
+def dump_json(instance: BaseModel, fields: Union[str, Fields], **options: Any) -> str:
+    """
+    `model_dump_json()` of the selected nodes only.
+    """
+    return instance.model_dump_json(include=include(type(instance), fields), **options)
+
+
+if __name__ == "__main__":
+    import gc
+    import json
+    import time
+
+    from models import synthetic
+
+    n, neighbors = 10_000, 8
+    data = json.dumps(synthetic.payload(n, neighbors))
+    selections = [
+        "interfaces-state/interface/name",
+        "interfaces-state/interface(name;oper-status;statistics/in-octets)",
+        "interfaces-state/interface(name;oper-status;statistics)",
+        "interfaces-state/interface(name;oper-status;statistics;ipv6)",
+        "interfaces;interfaces-state",
+    ]
+
+    def timed(function: Any, *args: Any) -> Tuple[Any, float]:
+        gc.collect()
+        start = time.perf_counter()
+        result = function(*args)
+        return result, time.perf_counter() - start
+
+    print(
+        f"{len(data) / 2**20:.1f} MiB document, {n} interfaces, "
+        f"{neighbors} neighbors each"
+    )
+    full, decode = timed(Model.model_validate_json, data)
+    _, encode = timed(full.model_dump_json)
+    print(f"{'Model':<70} decode {decode * 1e3:7.1f} ms  encode {encode * 1e3:7.1f} ms")
+    for fields in selections:
+        projection(Model, fields)
+        _, decode = timed(validate_json, data, fields)
+        _, encode = timed(dump_json, full, fields)
+        print(
+            f"{fields:<70} decode {decode * 1e3:7.1f} ms  encode {encode * 1e3:7.1f} ms"
+        )
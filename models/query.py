@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import re
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from models.ietf_interface import Model
+
+_STEP = re.compile(r"([\w\-.:]+)((?:\[[^\]]*\])*)")
+_PREDICATE = re.compile(r"\[([^\]]*)\]")
+_COMPARISON = re.compile(
+    r"\s*([\w\-.:]+)\s*(!=|<=|>=|=|<|>)\s*('[^']*'|\"[^\"]*\"|[^\s'\"]+)\s*$"
+)
+_AND = re.compile(r"\s+and\s+")
+_NUMBER = re.compile(r"[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)?")
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a is not None and a < b,
+    "<=": lambda a, b: a is not None and a <= b,
+    ">": lambda a, b: a is not None and a > b,
+    ">=": lambda a, b: a is not None and a >= b,
+}
+_ORDERING = frozenset(("<", "<=", ">", ">="))
+
+
+class Condition(NamedTuple):
+    leaf: str
+    op: str
+    value: Any
+
+
+class Step(NamedTuple):
+    name: str
+    conditions: Tuple[Condition, ...]
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=256)
+def parse(path: str) -> Tuple[Step, ...]:
+    """
+    Parse an XPath-like location path such as
+    `/interfaces-state/interface[type='iana-if-type:ethernetCsmacd'][oper-status='down']`.
+
+    Steps name data nodes by their YANG identifier, with or without module
+    prefix. Predicates compare a direct child leaf of the step against a
+    literal with `=`, `!=`, `<`, `<=`, `>`, `>=` and may be combined with
+    `and` or by chaining brackets. Literals are quoted strings or numbers,
+    optionally with a fraction or exponent, e.g. `[speed>1e9]`; all operators
+    compare a number against a numeric string as numbers.
+    """
+    steps = []
+    for part in _split(path.strip().lstrip("/")):
+        match = _STEP.fullmatch(part)
+        if match is None:
+            raise QuerySyntaxError(f"invalid step {part!r} in {path!r}")
+        conditions = []
+        for predicate in _PREDICATE.findall(match.group(2)):
+            for term in _AND.split(predicate.strip()):
+                comparison = _COMPARISON.match(term)
+                if comparison is None:
+                    raise QuerySyntaxError(f"invalid predicate {term!r} in {path!r}")
+                leaf, op, literal = comparison.groups()
+                conditions.append(Condition(_local(leaf), op, _literal(literal)))
+        steps.append(Step(_local(match.group(1)), tuple(conditions)))
+    return tuple(steps)
+
+
+def _split(path: str) -> List[str]:
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(path):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "/" and depth == 0:
+            parts.append(path[start:i])
+            start = i + 1
+    parts.append(path[start:])
+    return parts
+
+
+def _local(name: str) -> str:
+    return name.rsplit(":", 1)[-1]
+
+
+def _literal(text: str) -> Any:
+    if text[0] in "'\"":
+        return text[1:-1]
+    number = _number(text)
+    return text if number is None else number
+
+
+def _number(value: Any) -> Any:
+    """
+    `value` as an exact number (`int` if integral, else `Decimal`), or `None`
+    if it is not numeric.
+    """
+    if isinstance(value, (int, Decimal)) and not isinstance(value, bool):
+        return value
+    if not isinstance(value, str) or _NUMBER.fullmatch(value) is None:
+        return None
+    number = Decimal(value)
+    return int(number) if number == number.to_integral_value() else number
+
+
+def _scalar(value: Any) -> Any:
+    """
+    Normalize a leaf value to what a predicate literal compares against.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, str):
+        # A plain `str` for subclasses: `models.compact` values hash as
+        # their `Enum` member.
+        return str(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+@lru_cache(maxsize=None)
+def _fields(cls: Type[BaseModel]) -> Dict[str, str]:
+    """
+    YANG identifier (alias without module prefix) to attribute name.
+    """
+    names = {}
+    for attr, field in cls.model_fields.items():
+        names[_local(field.alias or attr)] = attr
+        names.setdefault(attr, attr)
+    return names
+
+
+def _attribute(node: BaseModel, name: str) -> str:
+    try:
+        return _fields(type(node))[name]
+    except KeyError:
+        raise KeyError(f"{type(node).__name__} has no node {name!r}") from None
+
+
+def _children(nodes: List[Any], name: str) -> List[Any]:
+    result: List[Any] = []
+    attr = None
+    for node in nodes:
+        attr = attr or _attribute(node, name)
+        value = getattr(node, attr)
+        if value is None:
+            continue
+        if isinstance(value, list):
+            result.extend(value)
+        else:
+            result.append(value)
+    return result
+
+
+def _matches(node: BaseModel, conditions: Tuple[Condition, ...]) -> bool:
+    for leaf, op, expected in conditions:
+        value = _scalar(getattr(node, _attribute(node, leaf)))
+        if value is not None:
+            value, expected = _comparable(leaf, op, value, expected)
+        if not _OPERATORS[op](value, expected):
+            return False
+    return True
+
+
+def _comparable(leaf: str, op: str, value: Any, expected: Any) -> Tuple[Any, Any]:
+    """
+    `value` and `expected` as two values `op` can compare: strings compare as
+    strings, anything else as numbers, so `[if-index='5']` and
+    `[if-index<'5']` compare numbers like `[if-index=5]`. A string that is
+    not numeric never equals a number and cannot be ordered against one.
+    """
+    if isinstance(value, str) and isinstance(expected, str):
+        return value, expected
+    numbers = _number(value), _number(expected)
+    if None not in numbers:
+        return numbers
+    if op in _ORDERING:
+        raise QuerySyntaxError(
+            f"cannot order {leaf!r} ({type(value).__name__}) against {expected!r}"
+        )
+    return value, expected
+
+
+def select(model: Model, path: str) -> List[Any]:
+    """
+    Evaluate `path` against `model` by scanning; see `QueryEngine` for the
+    indexed variant.
+    """
+    nodes: List[Any] = [model]
+    for step in parse(path):
+        nodes = _children(nodes, step.name)
+        if step.conditions:
+            nodes = [node for node in nodes if _matches(node, step.conditions)]
+    return nodes
+
+
+class QueryEngine:
+    """
+    Evaluates location paths against one `Model` with lazily built secondary
+    indexes.
+
+    For every equality condition on a string or enumeration leaf of a step
+    that is reached without earlier predicates, a value -> positions index is
+    built the first time it is needed and reused by later queries. The
+    remaining conditions are checked on the (usually much smaller) candidate
+    set. Indexes reflect the model at the time they were built; call
+    `invalidate()` after mutating it.
+    """
+
+    def __init__(self, model: Model):
+        self.model = model
+        self._nodes: Dict[Tuple[str, ...], List[Any]] = {}
+        self._indexes: Dict[Tuple[Tuple[str, ...], str], Optional[Dict]] = {}
+
+    def invalidate(self) -> None:
+        self._nodes.clear()
+        self._indexes.clear()
+
+    def select(self, path: str) -> List[Any]:
+        steps = parse(path)
+        nodes: List[Any] = [self.model]
+        prefix: Optional[Tuple[str, ...]] = ()
+        for step in steps:
+            if prefix is not None:
+                prefix = prefix + (step.name,)
+                nodes = self._all(prefix)
+            else:
+                nodes = _children(nodes, step.name)
+            if not step.conditions:
+                continue
+            remaining = step.conditions
+            if prefix is not None:
+                nodes, remaining = self._probe(prefix, nodes, step.conditions)
+                prefix = None
+            if remaining:
+                nodes = [node for node in nodes if _matches(node, remaining)]
+        return nodes
+
+    def _all(self, prefix: Tuple[str, ...]) -> List[Any]:
+        nodes = self._nodes.get(prefix)
+        if nodes is None:
+            parent = self._all(prefix[:-1]) if len(prefix) > 1 else [self.model]
+            nodes = self._nodes[prefix] = _children(parent, prefix[-1])
+        return nodes
+
+    def _probe(
+        self,
+        prefix: Tuple[str, ...],
+        nodes: List[Any],
+        conditions: Tuple[Condition, ...],
+    ) -> Tuple[List[Any], Tuple[Condition, ...]]:
+        positions = None
+        remaining = []
+        for condition in conditions:
+            index = None
+            if condition.op == "=" and isinstance(condition.value, str):
+                index = self._index(prefix, nodes, condition.leaf)
+            if index is None:
+                remaining.append(condition)
+                continue
+            hits = index.get(condition.value, ())
+            if positions is None:
+                positions = hits
+            else:
+                smaller, larger = sorted((positions, hits), key=len)
+                keep = set(larger)
+                positions = [p for p in smaller if p in keep]
+        if positions is None:
+            return nodes, conditions
+        return [nodes[p] for p in sorted(positions)], tuple(remaining)
+
+    def _index(
+        self, prefix: Tuple[str, ...], nodes: List[Any], leaf: str
+    ) -> Optional[Dict[Any, List[int]]]:
+        key = (prefix, leaf)
+        if key not in self._indexes:
+            index: Optional[Dict[Any, List[int]]] = {}
+            attr = _attribute(nodes[0], leaf) if nodes else None
+            for position, node in enumerate(nodes):
+                value = getattr(node, attr)
+                if not isinstance(value, (str, Enum)):
+                    if value is None:
+                        continue
+                    index = None
+                    break
+                index.setdefault(_scalar(value), []).append(position)
+            self._indexes[key] = index
+        return self._indexes[key]
+
+
+if __name__ == "__main__":
+    import gc
+    import time
+
+    from models import synthetic
+
+    queries = [
+        (
+            "/interfaces-state/interface[type='iana-if-type:ethernetCsmacd']"
+            "[oper-status='down']"
+        ),
+        "/interfaces-state/interface[name='eth42']",
+        "/interfaces-state/interface/ipv6/address[origin='static']",
+    ]
+    repeat = 20
+    for n in (1_000, 10_000, 100_000):
+        model = synthetic.model(n)
+        engine = QueryEngine(model)
+        gc.collect()
+        for path in queries:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                scanned = select(model, path)
+            scan = (time.perf_counter() - start) / repeat
+
+            start = time.perf_counter()
+            engine.select(path)
+            first = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(repeat):
+                indexed = engine.select(path)
+            warm = (time.perf_counter() - start) / repeat
+            assert indexed == scanned
+            print(
+                f"{n:>7} interfaces, {len(indexed):>6} hits: "
+                f"scan {scan * 1e3:8.2f} ms, indexed first {first * 1e3:8.2f} ms, "
+                f"warm {warm * 1e3:8.3f} ms  {path}"
+            )
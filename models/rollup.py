@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple, Union
+
+import numpy as np
+
+from models.ietf_interface import Model, StatisticsContainer2
+from models.interface_stack import InterfaceStack
+
+COUNTERS = tuple(
+    field
+    for field in StatisticsContainer2.model_fields
+    if field != "discontinuity_time"
+)
+
+MODULUS: Dict[str, int] = {
+    field: next(
+        m.le
+        for m in StatisticsContainer2.model_fields[field].metadata
+        if hasattr(m, "le")
+    )
+    + 1
+    for field in COUNTERS
+}
+"""
+Wrap-around modulus per counter: 2**64 for Counter64, 2**32 for Counter32 leaves.
+"""
+
+
+class Counter(NamedTuple):
+    values: np.ndarray
+    """
+    `uint64` value per interface, 0 where unsupported.
+    """
+    supported: np.ndarray
+    """
+    Whether at least one contributing interface reported the counter.
+    """
+    complete: np.ndarray
+    """
+    Whether every contributing interface reported the counter.
+    """
+
+
+class CounterRollup:
+    """
+    Statistics aggregated over the interface stack of the state tree.
+
+    `rollup()` sums a counter over each interface and everything transitively
+    layered underneath it (each interface counted once, even with diamonds in
+    the stack); `by_level()` sums it per stack level, 0 being the interfaces
+    with nothing underneath. Counters are read into `uint64` arrays once;
+    the stack closures are flattened into one index array with segment
+    offsets, so a roll-up is a single gather plus `np.add.reduceat`.
+
+    Sums wrap at the counter's own modulus like the counters themselves, so
+    rates between two polls must be computed with `delta()`. Unsupported
+    (`None`) counters contribute 0 and are tracked in `supported`/`complete`.
+    """
+
+    def __init__(self, source: Union[Model, InterfaceStack]):
+        stack = (
+            source
+            if isinstance(source, InterfaceStack)
+            else InterfaceStack.from_model(source, state=True)
+        )
+        self.names: List[str] = [entry.name for entry in stack.entries]
+        self._statistics = [entry.statistics for entry in stack.entries]
+        members: List[int] = []
+        offsets = [0]
+        for i in range(len(self.names)):
+            members.extend(stack.below(i))
+            offsets.append(len(members))
+        self._members = np.array(members, dtype=np.intp)
+        self._offsets = np.array(offsets, dtype=np.intp)
+        self.levels = np.array(stack.levels(), dtype=np.intp)
+        self._counters: Dict[str, Counter] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def counter(self, field: str) -> Counter:
+        """
+        The raw per-interface counter, read from the models on first use.
+        """
+        if field not in self._counters:
+            raw = [None if s is None else getattr(s, field) for s in self._statistics]
+            supported = np.array([v is not None for v in raw], dtype=bool)
+            values = np.array([v or 0 for v in raw], dtype=np.uint64)
+            self._counters[field] = Counter(values, supported, supported)
+        return self._counters[field]
+
+    def rollup(self, field: str) -> Counter:
+        counter = self.counter(field)
+        if not len(self):
+            return counter
+        starts = self._offsets[:-1]
+        values = np.add.reduceat(counter.values[self._members], starts)
+        reported = np.add.reduceat(
+            counter.supported[self._members].astype(np.intp), starts
+        )
+        sizes = np.diff(self._offsets)
+        return Counter(_wrap(values, field), reported > 0, reported == sizes)
+
+    def by_level(self, field: str) -> np.ndarray:
+        counter = self.counter(field)
+        totals = np.zeros(int(self.levels.max(initial=-1)) + 1, dtype=np.uint64)
+        np.add.at(totals, self.levels, counter.values)
+        return _wrap(totals, field)
+
+
+def delta(previous: np.ndarray, current: np.ndarray, field: str) -> np.ndarray:
+    """
+    Increase between two polls of the same counter, assuming it wrapped at
+    most once in between.
+    """
+    return _wrap(current - previous, field)
+
+
+def _wrap(values: np.ndarray, field: str) -> np.ndarray:
+    modulus = MODULUS[field]
+    if modulus > np.iinfo(np.uint64).max:
+        return values
+    return values % np.uint64(modulus)
+
+
+if __name__ == "__main__":
+    import gc
+    import time
+
+    from models import synthetic
+
+    def naive(entries: Dict[str, object], name: str, field: str) -> int:
+        entry = entries[name]
+        own = getattr(entry.statistics, field) or 0 if entry.statistics else 0
+        return own + sum(naive(entries, lower, field) for lower in entry.lower_layer_if)
+
+    for n in (1_000, 10_000, 100_000):
+        model = synthetic.model(n)
+        gc.collect()
+        start = time.perf_counter()
+        rollup = CounterRollup(model)
+        built = time.perf_counter() - start
+
+        start = time.perf_counter()
+        octets = [rollup.rollup(field) for field in ("in_octets", "out_octets")]
+        levels = [rollup.by_level(field) for field in ("in_octets", "out_octets")]
+        vectorized = time.perf_counter() - start
+
+        entries = {e.name: e for e in model.interfaces_state.interface}
+        start = time.perf_counter()
+        expected = [
+            [naive(entries, name, field) for name in entries]
+            for field in ("in_octets", "out_octets")
+        ]
+        recursive = time.perf_counter() - start
+        assert [c.values.tolist() for c in octets] == expected
+        print(
+            f"{n:>7} interfaces: build {built * 1e3:7.1f} ms, "
+            f"in/out roll-up + levels {vectorized * 1e3:6.2f} ms, "
+            f"python recursion {recursive * 1e3:8.1f} ms, levels {levels[0].tolist()}"
+        )
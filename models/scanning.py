@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type, get_args
+
+import numpy as np
+from pydantic import BaseModel
+from pydantic_core import PydanticCustomError
+from pydantic_core.core_schema import ErrorType
+
+from models.ietf_interface import InterfaceListEntry, InterfaceListEntry2, Model
+
+BLOCK = 1 << 24
+"""
+Bytes scanned per numpy pass when locating entries, bounding the scanner's
+temporary arrays to a few times this size.
+"""
+
+LISTS = {
+    b'"ietf-interfaces:interfaces"': InterfaceListEntry,
+    b'"ietf-interfaces:interfaces-state"': InterfaceListEntry2,
+}
+INTERFACE = b'"ietf-interfaces:interface"'
+_FIELDS = {info.alias: k for k, info in enumerate(Model.model_fields.values())}
+_KNOWN_ERRORS = frozenset(get_args(ErrorType))
+_COLON = re.compile(rb"\s*:\s*")
+
+
+class Array(NamedTuple):
+    container: str
+    """
+    Alias of the container holding the list.
+    """
+    entry: Type[BaseModel]
+    opening: int
+    closing: int
+    starts: np.ndarray
+    ends: np.ndarray
+    """
+    Offsets of the first and one past the last byte of each entry.
+    """
+
+
+class Structure:
+    """
+    Brackets outside of JSON strings, with the nesting depth after each.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        array = np.frombuffer(data, np.uint8)
+        positions, quotes = [], 0
+        for offset in range(0, len(data), BLOCK):
+            block = array[offset : offset + BLOCK]
+            quote = np.flatnonzero(block == 34) + offset
+            suspect = quote[array[quote - 1] == 92]
+            escaped = [q for q in suspect.tolist() if _escaped(data, q)]
+            if escaped:
+                quote = np.setdiff1d(quote, escaped)
+            bracket = np.flatnonzero(
+                (block == 123) | (block == 125) | (block == 91) | (block == 93)
+            )
+            bracket += offset
+            outside = (quotes + np.searchsorted(quote, bracket)) % 2 == 0
+            positions.append(bracket[outside])
+            quotes += len(quote)
+        self.positions = np.concatenate(positions) if positions else np.zeros(0, int)
+        self.chars = array[self.positions]
+        opening = (self.chars == 123) | (self.chars == 91)
+        self.depths = np.cumsum(np.where(opening, 1, -1))
+
+    def depth(self, position: int) -> int:
+        """
+        Nesting depth at `position`.
+        """
+        index = int(np.searchsorted(self.positions, position)) - 1
+        return 0 if index < 0 else int(self.depths[index])
+
+    def member(self, name: bytes, depth: int, start: int, end: int) -> Optional[int]:
+        """
+        Offset of the only member called `name` at `depth` between two
+        offsets; `None` if there is none or more than one.
+        """
+        found = []
+        position = self.data.find(name, start, end)
+        while position >= 0:
+            if (
+                self.depth(position) == depth
+                and not _escaped(self.data, position)
+                and _COLON.match(self.data, position + len(name))
+            ):
+                found.append(position)
+            position = self.data.find(name, position + 1, end)
+        return found[0] if len(found) == 1 else None
+
+    def value(self, key: int, kind: int) -> Optional[Tuple[int, int]]:
+        """
+        Indexes into `positions` of the brackets enclosing the value of the
+        member whose name ends at `key`, if the value is a `kind` bracket.
+        """
+        start = int(np.searchsorted(self.positions, key))
+        if start == len(self.positions) or self.chars[start] != kind:
+            return None
+        if not _COLON.fullmatch(self.data, key, int(self.positions[start])):
+            return None
+        depth = self.depths[start] - 1
+        return start, start + 1 + int(np.argmax(self.depths[start + 1 :] == depth))
+
+
+def _escaped(data: bytes, position: int) -> bool:
+    backslashes = 0
+    while position > backslashes and data[position - backslashes - 1] == 92:
+        backslashes += 1
+    return backslashes % 2 == 1
+
+
+def find_arrays(data: bytes) -> List[Array]:
+    """
+    The interface lists of a `Model` document, in field order. Lists that
+    cannot be split safely are left out and validated serially.
+    """
+    structure = Structure(data)
+    if not len(structure.positions) or structure.depths[-1] != 0:
+        return []
+    arrays = []
+    for name, entry in LISTS.items():
+        key = structure.member(name, 1, 0, len(data))
+        container = key is not None and structure.value(key + len(name), 123)
+        if not container:
+            continue
+        start, end = (int(structure.positions[i]) for i in container)
+        key = structure.member(INTERFACE, 2, start, end)
+        items = key is not None and structure.value(key + len(INTERFACE), 91)
+        if not items:
+            continue
+        inner = slice(items[0] + 1, items[1])
+        depth = structure.depths[items[0]]
+        chars, depths = structure.chars[inner], structure.depths[inner]
+        positions = structure.positions[inner]
+        starts = positions[(chars == 123) & (depths == depth + 1)]
+        ends = positions[(chars == 125) & (depths == depth)] + 1
+        opening, closing = (int(structure.positions[i]) for i in items)
+        if only_objects(data, opening, closing, starts, ends):
+            arrays.append(
+                Array(name.strip(b'"').decode(), entry, opening, closing, starts, ends)
+            )
+    return arrays
+
+
+def only_objects(
+    data: bytes, opening: int, closing: int, starts: np.ndarray, ends: np.ndarray
+) -> bool:
+    """
+    Whether the list holds nothing but the objects found.
+    """
+    gaps = zip([opening + 1, *ends.tolist()], [*starts.tolist(), closing])
+    separators = [data[start:end].strip() for start, end in gaps]
+    if not starts.size:
+        return separators == [b""]
+    return separators[0] == separators[-1] == b"" and all(
+        separator == b"," for separator in separators[1:-1]
+    )
+
+
+def model_field(alias: str) -> str:
+    """
+    The `Model` field of the container called `alias` in JSON.
+    """
+    return next(
+        attr for attr, info in Model.model_fields.items() if info.alias == alias
+    )
+
+
+def relocate(
+    error: Dict[str, Any], prefix: Tuple[str, str], offset: int
+) -> Dict[str, Any]:
+    """
+    A chunk's error, located in the whole document.
+    """
+    index, *loc = error["loc"]
+    return error_details(error, (*prefix, index + offset, *loc))
+
+
+def error_details(error: Dict[str, Any], loc: Tuple[Any, ...]) -> Dict[str, Any]:
+    """
+    `error` as accepted by `ValidationError.from_exception_data`, at `loc`.
+    """
+    details = {"type": error["type"], "loc": loc, "input": error["input"]}
+    if error["type"] not in _KNOWN_ERRORS:
+        details["type"] = PydanticCustomError(
+            error["type"], error["msg"], error.get("ctx")
+        )
+    elif "ctx" in error:
+        details["ctx"] = error["ctx"]
+    return details
+
+
+def field_position(loc: Tuple[Any, ...]) -> int:
+    """
+    Position among the `Model` fields of the container `loc` starts with;
+    -1 for the document itself. Validation reports errors in field order.
+    """
+    return _FIELDS.get(loc[0], len(_FIELDS)) if loc else -1
+
+
+def serial_order(errors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    The errors of a skeleton and of its lists' chunks in the order
+    validating the whole document reports them. A container's only field is
+    its interface list, so ordering by container suffices.
+    """
+    return sorted(errors, key=lambda error: field_position(error["loc"]))
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import os
+import sys
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import Any, Dict, Optional, Tuple, Type, Union
+
+import pyarrow as pa
+from typing_extensions import Self
+
+from models.arrow import SCHEMA, from_record_batch, record_batches
+from models.ietf_interface import (
+    InterfaceListEntry2,
+    InterfacesStateContainer,
+    Model,
+)
+
+_TRACKED = sys.version_info < (3, 13) and os.name == "posix"
+"""
+Whether `SharedMemory` registers every segment it opens with the resource
+tracker, with no way to opt out.
+"""
+
+if _TRACKED:
+    import _posixshmem
+
+
+class SharedState:
+    """
+    A snapshot of the operational interface list in a shared memory segment,
+    readable by many processes without parsing or copying it.
+
+    The segment holds an Arrow IPC stream with the fixed, schema-derived
+    layout of `models.arrow.SCHEMA`: counters are packed unsigned integer
+    columns, enumerations int8 codes, names and addresses offset-indexed
+    strings. Readers map the columns in place (`column()`, `table`) and
+    validate `InterfaceListEntry2` objects only for the entries they ask for.
+
+    The creating process owns the segment: it alone unlinks it, with
+    `unlink()` or by leaving the `with` block, once every reader is done;
+    readers only `close()`. No process registers the segment with the
+    multiprocessing resource tracker, so readers exiting, crashed or not,
+    never remove it, and a creator that dies without unlinking it leaks it
+    until the host restarts or another process unlinks it by name
+    (`SharedState.attach(name).unlink()`). A snapshot is immutable: publish
+    a new one for a new state.
+    """
+
+    def __init__(self, memory: SharedMemory, owner: bool):
+        self.memory = memory
+        self.owner = owner
+        self.table = _read(memory)
+        self._positions: Optional[Dict[str, int]] = None
+        self._entries: Dict[int, InterfaceListEntry2] = {}
+
+    @classmethod
+    def create(
+        cls,
+        state: Union[Model, InterfacesStateContainer],
+        name: Optional[str] = None,
+    ) -> SharedState:
+        """
+        Publish `state` in a new segment, named `name` or a random name.
+        """
+        batches = list(record_batches(state))
+        size = pa.MockOutputStream()
+        _write(size, batches)
+        memory = _open(name, create=True, size=max(size.size(), 1))
+        try:
+            _write(pa.FixedSizeBufferWriter(pa.py_buffer(memory.buf)), batches)
+            return cls(memory, owner=True)
+        except BaseException:
+            memory.close()
+            _unlink(memory)
+            raise
+
+    @classmethod
+    def attach(cls, name: str) -> SharedState:
+        """
+        Map a segment published by `create()` in another process.
+        """
+        return cls(_open(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def __getitem__(self, position: int) -> InterfaceListEntry2:
+        """
+        The entry at `position`, validated on first access.
+        """
+        if not -len(self) <= position < len(self):
+            raise IndexError(f"interface {position} out of range")
+        position %= len(self)
+        entry = self._entries.get(position)
+        if entry is None:
+            row = self.table.slice(position, 1).combine_chunks().to_batches()[0]
+            entry = self._entries[position] = from_record_batch(row)[0]
+        return entry
+
+    def get(self, name: str) -> Optional[InterfaceListEntry2]:
+        """
+        The entry named `name`, or `None`.
+        """
+        if self._positions is None:
+            names = self.table.column("name").to_pylist()
+            self._positions = {name: position for position, name in enumerate(names)}
+        position = self._positions.get(name)
+        return None if position is None else self[position]
+
+    def column(self, name: str) -> pa.ChunkedArray:
+        """
+        One column of `models.arrow.SCHEMA`, backed by the shared segment.
+        """
+        return self.table.column(name)
+
+    def close(self) -> None:
+        """
+        Unmap the segment. Arrays obtained from `column()` or `table` must be
+        released first, since they point into it: otherwise `BufferError` is
+        raised and the snapshot stays open and usable.
+        """
+        # `table` holds the export of `memory.buf` that `close()` releases.
+        self.table = None
+        try:
+            self.memory.close()
+        except BufferError:
+            self.table = _read(self.memory)
+            raise
+        self._positions = None
+
+    def unlink(self) -> None:
+        """
+        Remove the segment; called by its owner. Processes that mapped it
+        keep their mapping until they `close()`.
+        """
+        _unlink(self.memory)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+def _open(name: Optional[str], create: bool = False, size: int = 0) -> SharedMemory:
+    """
+    A segment the resource tracker does not know about.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, create, size, track=False)
+    memory = SharedMemory(name, create, size)
+    if _TRACKED:
+        resource_tracker.unregister(memory._name, "shared_memory")
+    return memory
+
+
+def _unlink(memory: SharedMemory) -> None:
+    if _TRACKED:
+        # `SharedMemory.unlink()` would unregister the segment again, which
+        # the tracker reports as an error.
+        _posixshmem.shm_unlink(memory._name)
+    else:
+        memory.unlink()
+
+
+def _read(memory: SharedMemory) -> pa.Table:
+    return pa.ipc.open_stream(pa.py_buffer(memory.buf)).read_all()
+
+
+def _write(sink: Any, batches: Any) -> None:
+    with pa.ipc.new_stream(sink, SCHEMA) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+
+
+def _resident() -> int:
+    # ru_maxrss would be inherited from the process that forked the worker.
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _parse_worker(path: str, names: Any) -> Tuple[float, int]:
+    import time
+
+    start = time.perf_counter()
+    with open(path, "rb") as file:
+        state = InterfacesStateContainer.model_validate_json(file.read())
+    entries = {entry.name: entry for entry in state.interface}
+    sum(entry.statistics.in_octets for entry in state.interface)
+    [entries[name].oper_status for name in names]
+    return time.perf_counter() - start, _resident()
+
+
+def _shared_worker(segment: str, names: Any) -> Tuple[float, int]:
+    import time
+
+    import pyarrow.compute as pc
+
+    start = time.perf_counter()
+    with SharedState.attach(segment) as store:
+        pc.sum(store.column("statistics_in_octets")).as_py()
+        [store.get(name).oper_status for name in names]
+        return time.perf_counter() - start, _resident()
+
+
+if __name__ == "__main__":
+    import gc
+    import random
+    import tempfile
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import get_context
+
+    from models import synthetic
+
+    n, neighbors, workers, lookups = 20_000, 4, 4, 100
+    state = synthetic.model(n, neighbors).interfaces_state
+    names = random.Random(0).sample([entry.name for entry in state.interface], lookups)
+    gc.collect()
+
+    start = time.perf_counter()
+    store = SharedState.create(state)
+    published = time.perf_counter() - start
+    with store, tempfile.TemporaryDirectory() as tmp:
+        assert all(store[i] == state.interface[i] for i in range(0, n, 997))
+        path = os.path.join(tmp, "state.json")
+        with open(path, "w") as file:
+            file.write(state.model_dump_json(by_alias=True, exclude_none=True))
+        print(
+            f"{n:,} interfaces x {neighbors} neighbors: segment "
+            f"{store.memory.size / 2**20:.1f} MiB published in {published:.2f} s, "
+            f"JSON snapshot {os.path.getsize(path) / 2**20:.1f} MiB"
+        )
+        for label, worker, source in (
+            ("parse JSON snapshot", _parse_worker, path),
+            ("attach shared segment", _shared_worker, store.name),
+        ):
+            # Spawned, so that workers share nothing with this process.
+            context = get_context("spawn")
+            with ProcessPoolExecutor(workers, mp_context=context) as pool:
+                results = list(pool.map(worker, [source] * workers, [names] * workers))
+            elapsed = sum(elapsed for elapsed, _ in results) / workers
+            rss = max(rss for _, rss in results)
+            print(
+                f"{workers} workers, {label:<22}: {elapsed:7.3f} s and "
+                f"{rss / 2**20:5.0f} MiB resident per worker (sum of in-octets, "
+                f"{lookups} entries materialized)"
+            )
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from models.ietf_interface import Model
+
+PORTS_PER_LAG = 4
+
+
+def _stack(n: int) -> List[Dict[str, Any]]:
+    """
+    Build `n` interface stubs layered as physical port -> LAG -> sub-interface.
+
+    Every `PORTS_PER_LAG` physical ports are bundled into one LAG and each LAG
+    carries a single VLAN sub-interface, so both `higher-layer-if` and
+    `lower-layer-if` are populated consistently.
+    """
+    group = PORTS_PER_LAG + 2
+    entries: List[Dict[str, Any]] = []
+    for lag in range(n // group + 1):
+        ports = [f"eth{lag * PORTS_PER_LAG + p}" for p in range(PORTS_PER_LAG)]
+        lag_name, sub_name = f"lag{lag}", f"lag{lag}.10"
+        for port in ports:
+            entries.append(
+                {
+                    "name": port,
+                    "type": "iana-if-type:ethernetCsmacd",
+                    "higher": [lag_name],
+                    "lower": [],
+                }
+            )
+        entries.append(
+            {
+                "name": lag_name,
+                "type": "iana-if-type:ieee8023adLag",
+                "higher": [sub_name],
+                "lower": ports,
+            }
+        )
+        entries.append(
+            {
+                "name": sub_name,
+                "type": "iana-if-type:l2vlan",
+                "higher": [],
+                "lower": [lag_name],
+            }
+        )
+    entries = entries[:n]
+    names = {e["name"] for e in entries}
+    for e in entries:
+        e["higher"] = [name for name in e["higher"] if name in names]
+        e["lower"] = [name for name in e["lower"] if name in names]
+    return entries
+
+
+def _ipv4(i: int) -> str:
+    return f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"
+
+
+def _ipv6(prefix: str, i: int) -> str:
+    return f"{prefix}:{i >> 16 & 0xFFFF:x}:{i & 0xFFFF:x}"
+
+
+def _mac(i: int) -> str:
+    return ":".join(f"{b:02x}" for b in (0x02, 0, *i.to_bytes(4, "big")))
+
+
+def config_payload(n: int) -> Dict[str, Any]:
+    """
+    RESTCONF-style `ietf-interfaces:interfaces` payload with `n` interfaces.
+    """
+    interfaces = []
+    for i, stub in enumerate(_stack(n)):
+        interfaces.append(
+            {
+                "ietf-interfaces:name": stub["name"],
+                "ietf-interfaces:type": stub["type"],
+                "ietf-interfaces:enabled": i % 10 != 0,
+                "ietf-interfaces:admin-status": "up" if i % 10 else "down",
+                "ietf-interfaces:oper-status": "up" if i % 7 else "down",
+                "ietf-interfaces:if-index": i + 1,
+                "ietf-interfaces:higher-layer-if": stub["higher"],
+                "ietf-interfaces:lower-layer-if": stub["lower"],
+                "ietf-ip:ipv4": {
+                    "ietf-ip:address": [
+                        {
+                            "ietf-ip:ip": _ipv4(i),
+                            "ietf-ip:subnet": {"ietf-ip:prefix-length": 31},
+                        }
+                    ]
+                },
+            }
+        )
+    return {"ietf-interfaces:interface": interfaces}
+
+
+def state_payload(n: int, neighbors: int = 0) -> Dict[str, Any]:
+    """
+    RESTCONF-style `ietf-interfaces:interfaces-state` payload with `n`
+    interfaces, each carrying `neighbors` IPv6 neighbor cache entries.
+    """
+    interfaces = []
+    for i, stub in enumerate(_stack(n)):
+        interfaces.append(
+            {
+                "ietf-interfaces:name": stub["name"],
+                "ietf-interfaces:type": stub["type"],
+                "ietf-interfaces:admin-status": "up" if i % 10 else "down",
+                "ietf-interfaces:oper-status": "up" if i % 7 else "down",
+                "ietf-interfaces:last-change": f"2024-01-{i % 28 + 1:02d}T12:00:00Z",
+                "ietf-interfaces:if-index": i + 1,
+                "ietf-interfaces:phys-address": _mac(i),
+                "ietf-interfaces:higher-layer-if": stub["higher"],
+                "ietf-interfaces:lower-layer-if": stub["lower"],
+                "ietf-interfaces:speed": 10_000_000_000,
+                "ietf-interfaces:statistics": {
+                    "ietf-interfaces:discontinuity-time": "2024-01-01T00:00:00Z",
+                    "ietf-interfaces:in-octets": i * 1_000,
+                    "ietf-interfaces:out-octets": i * 2_000,
+                    "ietf-interfaces:in-errors": i % 3,
+                },
+                "ietf-ip:ipv6": {
+                    "ietf-ip:address": [
+                        {
+                            "ietf-ip:ip": _ipv6("2001:db8:", i),
+                            "ietf-ip:prefix-length": 64,
+                            "ietf-ip:origin": "static",
+                            "ietf-ip:status": "preferred",
+                        }
+                    ],
+                    "ietf-ip:neighbor": [
+                        {
+                            "ietf-ip:ip": _ipv6("fe80:", i * neighbors + k),
+                            "ietf-ip:link-layer-address": _mac(i * neighbors + k),
+                            "ietf-ip:origin": "dynamic",
+                            "ietf-ip:state": "reachable",
+                        }
+                        for k in range(neighbors)
+                    ],
+                },
+            }
+        )
+    return {"ietf-interfaces:interface": interfaces}
+
+
+def payload(n: int, neighbors: int = 0) -> Dict[str, Any]:
+    """
+    Full document with matching config and state for `n` interfaces.
+    """
+    return {
+        "ietf-interfaces:interfaces": config_payload(n),
+        "ietf-interfaces:interfaces-state": state_payload(n, neighbors),
+    }
+
+
+def model(n: int, neighbors: int = 0) -> Model:
+    return Model.model_validate(payload(n, neighbors))
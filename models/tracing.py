@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from contextvars import ContextVar
+from inspect import getattr_static
+from types import TracebackType
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from typing_extensions import Self
+
+from models.ietf_interface import (
+    InterfaceListEntry,
+    InterfaceListEntry2,
+    InterfacesContainer,
+    InterfacesStateContainer,
+    Model,
+)
+
+INSTRUMENTED: Tuple[Type[BaseModel], ...] = (
+    Model,
+    InterfacesContainer,
+    InterfacesStateContainer,
+    InterfaceListEntry,
+    InterfaceListEntry2,
+)
+"""
+Classes `instrument()` wraps by default: the whole document and the
+subtrees RESTCONF clients fetch or send on their own.
+"""
+
+
+class SpanData(NamedTuple):
+    name: str
+    trace_id: int
+    span_id: int
+    parent_id: Optional[int]
+    start: int
+    """
+    Nanoseconds since the Unix epoch, as `end`.
+    """
+    end: int
+    attributes: Dict[str, Any]
+    error: Optional[str]
+    """
+    `repr()` of the exception that ended the span, if any.
+    """
+
+
+class MemoryExporter:
+    """
+    Keeps finished spans in `spans`, for tests and in-process inspection.
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[SpanData] = []
+
+    def export(self, span: SpanData) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class FileExporter:
+    """
+    Appends finished spans to `path` as JSON lines, with OTLP/JSON field
+    names (`traceId`, `startTimeUnixNano`, ...), for offline analysis.
+
+    Lines are buffered and appended `buffer` at a time, opening the file
+    only while writing; `flush()` or `close()`, or leaving the exporter as a
+    context manager, writes the rest.
+    """
+
+    def __init__(self, path: str, buffer: int = 256) -> None:
+        self.path = path
+        self.buffer = buffer
+        self._lines: List[str] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def export(self, span: SpanData) -> None:
+        record = {
+            "name": span.name,
+            "traceId": f"{span.trace_id:032x}",
+            "spanId": f"{span.span_id:016x}",
+            "parentSpanId": "" if span.parent_id is None else f"{span.parent_id:016x}",
+            "startTimeUnixNano": span.start,
+            "endTimeUnixNano": span.end,
+            "attributes": span.attributes,
+            "status": (
+                {"code": "STATUS_CODE_UNSET"}
+                if span.error is None
+                else {"code": "STATUS_CODE_ERROR", "message": span.error}
+            ),
+        }
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._lines.append(line)
+            if len(self._lines) >= self.buffer:
+                self._write()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write()
+
+    def close(self) -> None:
+        self.flush()
+
+    def _write(self) -> None:
+        if self._lines:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.writelines(self._lines)
+            self._lines.clear()
+
+
+class _Span:
+    __slots__ = ("_name", "_parent", "_token", "_tracer", "attributes", "ids", "start")
+
+    def __init__(
+        self, tracer: Tracer, name: str, attributes: Optional[Dict[str, Any]]
+    ) -> None:
+        self._tracer = tracer
+        self._name = name
+        self.attributes = dict(attributes or ())
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def is_recording(self) -> bool:
+        return True
+
+    def __enter__(self) -> Self:
+        self._parent = _current.get()
+        if self._parent is None:
+            trace_id = random.getrandbits(128)
+        else:
+            trace_id = self._parent.ids[0]
+        self.ids = (trace_id, random.getrandbits(64))
+        self._token = _current.set(self)
+        self.start = time.time_ns()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        end = time.time_ns()
+        _current.reset(self._token)
+        parent = self._parent
+        self._tracer.exporter.export(
+            SpanData(
+                self._name,
+                self.ids[0],
+                self.ids[1],
+                None if parent is None else parent.ids[1],
+                self.start,
+                end,
+                self.attributes,
+                None if exc is None else repr(exc),
+            )
+        )
+
+
+_current: ContextVar[Optional[_Span]] = ContextVar("span", default=None)
+
+
+class Tracer:
+    """
+    A minimal in-process tracer with the subset of the OpenTelemetry
+    `Tracer`/`Span` API that `instrument()` uses, for when the OpenTelemetry
+    SDK is not installed. Spans nest through a context variable and are
+    handed to `exporter` as they end.
+    """
+
+    def __init__(self, exporter: Any = None) -> None:
+        self.exporter = MemoryExporter() if exporter is None else exporter
+
+    def start_as_current_span(
+        self, name: str, attributes: Optional[Dict[str, Any]] = None
+    ) -> _Span:
+        return _Span(self, name, attributes)
+
+
+_instrumented: Dict[Type[BaseModel], Dict[str, Any]] = {}
+
+
+def instrument(tracer: Any, classes: Sequence[Type[BaseModel]] = INSTRUMENTED) -> None:
+    """
+    Wrap `model_validate_json` and `model_dump_json` of `classes` in spans
+    named e.g. `InterfacesStateContainer.model_validate_json`, started with
+    `tracer.start_as_current_span()`: an OpenTelemetry tracer
+    (`opentelemetry.trace.get_tracer(...)`) or a `Tracer`.
+
+    A span covers one call of a wrapped method. Validating or dumping a
+    document handles its subtrees inside pydantic-core without calling their
+    methods, so there are no child spans per container or interface: a
+    `Model` call is one span, and time only splits by subtree when the
+    caller validates or dumps subtrees on their own.
+
+    Attributes: `payload.bytes` (JSON input or output), `interface.count`
+    (interface list entries in the model) and, for validation, `error.count`.
+    An exception propagates through the span, which the tracer records as
+    its status.
+
+    Tracing is off unless instrumented: `uninstrument()` restores the
+    original methods, so untraced calls have no overhead at all. Classes
+    already instrumented keep their tracer.
+    """
+    for cls in classes:
+        if cls in _instrumented:
+            continue
+        _instrumented[cls] = {
+            name: cls.__dict__[name]
+            for name in ("model_validate_json", "model_dump_json")
+            if name in cls.__dict__
+        }
+        cls.model_validate_json = _validate_json(
+            tracer, getattr_static(cls, "model_validate_json").__func__
+        )
+        cls.model_dump_json = _dump_json(tracer, getattr_static(cls, "model_dump_json"))
+
+
+def uninstrument() -> None:
+    for cls, originals in _instrumented.items():
+        for name in ("model_validate_json", "model_dump_json"):
+            if name in originals:
+                setattr(cls, name, originals[name])
+            else:
+                delattr(cls, name)
+    _instrumented.clear()
+
+
+def _validate_json(tracer: Any, validate: Any) -> classmethod:
+    def model_validate_json(cls: Any, json_data: Any, *args: Any, **kwargs: Any) -> Any:
+        with tracer.start_as_current_span(
+            f"{cls.__name__}.model_validate_json",
+            attributes={"payload.bytes": _size(json_data)},
+        ) as span:
+            try:
+                model = validate(cls, json_data, *args, **kwargs)
+            except ValidationError as error:
+                span.set_attribute("error.count", error.error_count())
+                raise
+            span.set_attribute("interface.count", _interface_count(model))
+            span.set_attribute("error.count", 0)
+            return model
+
+    model_validate_json.__doc__ = validate.__doc__
+    return classmethod(model_validate_json)
+
+
+def _dump_json(tracer: Any, dump: Any) -> Any:
+    def model_dump_json(self: BaseModel, *args: Any, **kwargs: Any) -> str:
+        with tracer.start_as_current_span(
+            f"{type(self).__name__}.model_dump_json",
+            attributes={"interface.count": _interface_count(self)},
+        ) as span:
+            json_data = dump(self, *args, **kwargs)
+            span.set_attribute("payload.bytes", _size(json_data))
+            return json_data
+
+    model_dump_json.__doc__ = dump.__doc__
+    return model_dump_json
+
+
+def _size(json_data: Any) -> int:
+    if isinstance(json_data, str):
+        # `isascii()` reads a flag of the string; only non-ASCII text is encoded.
+        return len(json_data) if json_data.isascii() else len(json_data.encode())
+    return len(json_data)
+
+
+def _interface_count(model: Any) -> int:
+    if isinstance(model, Model):
+        return sum(
+            _interface_count(container)
+            for container in (model.interfaces, model.interfaces_state)
+            if container is not None
+        )
+    if isinstance(model, (InterfacesContainer, InterfacesStateContainer)):
+        return len(model.interface or ())
+    return int(isinstance(model, (InterfaceListEntry, InterfaceListEntry2)))
+
+
+if __name__ == "__main__":
+    import gc
+    import os
+    import tempfile
+
+    from models import synthetic
+
+    n, runs, small = 2_000, 7, 10_000
+    document = synthetic.model(n, 4).model_dump_json(by_alias=True)
+    entry = synthetic.model(1).interfaces_state.interface[0]
+    entry_json = entry.model_dump_json(by_alias=True)
+
+    def best(function: Any, repeat: int = 1) -> float:
+        timings = []
+        for _ in range(runs):
+            gc.collect()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                function()
+            timings.append((time.perf_counter() - start) / repeat)
+        return min(timings) * 1e6
+
+    def measure(label: str) -> None:
+        def round_trip() -> None:
+            Model.model_validate_json(document).model_dump_json(
+                by_alias=True, exclude_defaults=True
+            )
+
+        def entries() -> None:
+            InterfaceListEntry2.model_validate_json(entry_json)
+
+        print(
+            f"{label:<28} document {best(round_trip) / 1000:7.1f} ms, "
+            f"single entry {best(entries, small):6.2f} us"
+        )
+
+    print(f"{n:,}-interface document ({len(document) / 2**20:.1f} MiB) round trip")
+    measure("not instrumented")
+    tracer = Tracer()
+    instrument(tracer)
+    measure("Tracer() + MemoryExporter")
+    uninstrument()
+    measure("uninstrumented again")
+    assert Model.model_validate_json.__func__ is BaseModel.model_validate_json.__func__
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "spans.jsonl")
+        with FileExporter(path) as exporter:
+            instrument(Tracer(exporter))
+            with Tracer(exporter).start_as_current_span("request"):
+                state = InterfacesStateContainer.model_validate_json(
+                    json.dumps(synthetic.state_payload(10))
+                )
+                state.model_dump_json(by_alias=True)
+                try:
+                    Model.model_validate_json('{"ietf-interfaces:interfaces": {}}x')
+                except ValidationError:
+                    pass
+            uninstrument()
+        with open(path, encoding="utf-8") as spans:
+            for line in spans:
+                record = json.loads(line)
+                duration = (
+                    record["endTimeUnixNano"] - record["startTimeUnixNano"]
+                ) / 1e3
+                print(
+                    f"{record['name']:<42} {duration:8.1f} us "
+                    f"{record['attributes']} {record['status']['code']}"
+                )
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from models import bounded, synthetic
+from models.ietf_interface import Model
+
+
+def _errors(validate, data):
+    with pytest.raises(ValidationError) as raised:
+        validate(data)
+    return raised.value.errors(include_url=False)
+
+
+def _document(n: int) -> bytes:
+    """
+    Invalid in a config entry, which is split out, and in the state list,
+    which is left in the skeleton because it holds a non-object.
+    """
+    document = synthetic.payload(n)
+    config = document["ietf-interfaces:interfaces"]["ietf-interfaces:interface"]
+    config[1]["ietf-interfaces:name"] = 5
+    state = document["ietf-interfaces:interfaces-state"]["ietf-interfaces:interface"]
+    state[0]["ietf-interfaces:if-index"] = 0
+    state.append(5)
+    return json.dumps(document).encode()
+
+
+@pytest.mark.parametrize("max_errors", [1, 2, 3, 100])
+def test_first_errors_are_those_of_serial_validation(max_errors):
+    data = _document(20)
+    serial = _errors(Model.model_validate_json, data)
+    assert len(serial) == 3
+    assert serial[0]["loc"][0] == "ietf-interfaces:interfaces"
+    errors = _errors(lambda d: bounded.validate_json(d, max_errors), data)
+    assert errors == serial[:max_errors]
+
+
+def test_valid_document():
+    data = json.dumps(synthetic.payload(20)).encode()
+    assert bounded.validate_json(data) == Model.model_validate_json(data)
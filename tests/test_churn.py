@@ -0,0 +1,38 @@
+import pytest
+
+from models.churn import table_delta
+from models.ietf_interface import NeighborListEntry4
+from models.neighbors import NeighborTable
+
+
+def _table(neighbors):
+    return NeighborTable.from_entries(
+        [
+            NeighborListEntry4(ip=ip, link_layer_address=mac, state=state)
+            for ip, mac, state in neighbors
+        ]
+    )
+
+
+OLD = [
+    ("fe80::1", "00:00:5e:00:53:01", "reachable"),
+    ("fe80::2", "00:00:5e:00:53:02", "reachable"),
+    ("fe80::3", "00:00:5E:00:53:03", "reachable"),
+    ("fe80::4", "00:00:5e:00:53:04", "reachable"),
+]
+NEW = [
+    ("fe80::5", "00:00:5e:00:53:05", "reachable"),
+    ("fe80::4", "00:00:5e:00:53:04", "stale"),
+    ("fe80::3", "00:00:5e:00:53:03", "reachable"),
+    ("fe80::2", "00:00:5e:00:53:02", "reachable"),
+]
+
+
+@pytest.mark.parametrize("zone", ["", "%eth0"])
+def test_table_delta(zone):
+    # A zone index keeps addresses as text; the upper-case MAC always is.
+    old = _table([(ip + zone, mac, state) for ip, mac, state in OLD])
+    new = _table([(ip + zone, mac, state) for ip, mac, state in NEW])
+    assert bool(old.text_ips) == bool(zone) and list(old.text_macs) == [2]
+    delta = table_delta(old, new)
+    assert [p.tolist() for p in delta] == [[0], [0], [1, 2]]
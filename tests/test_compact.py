@@ -0,0 +1,51 @@
+import pickle
+
+import numpy as np
+
+from models import synthetic
+from models.compact import compact, string_enum
+from models.ietf_interface import EnumerationEnum8, EnumerationEnum9, Model
+from models.query import QueryEngine, select
+from models.reconcile import OPER_STATUS, Reconciliation
+
+DOWN = EnumerationEnum9.lower_layer_down
+
+
+def _document():
+    document = synthetic.payload(len(OPER_STATUS))
+    state = document["ietf-interfaces:interfaces-state"]["ietf-interfaces:interface"]
+    for entry, status in zip(state, OPER_STATUS):
+        entry["ietf-interfaces:admin-status"] = "up"
+        entry["ietf-interfaces:oper-status"] = status
+    return document
+
+
+def test_values_compare_equal_to_members_and_strings():
+    entry = compact(Model).model_validate(_document()).interfaces_state.interface[0]
+    assert entry.admin_status == EnumerationEnum8.up
+    assert entry.oper_status == EnumerationEnum9.up and entry.oper_status == "up"
+    assert entry.oper_status != EnumerationEnum9.down
+    assert entry.oper_status != EnumerationEnum8.up
+
+
+def test_values_hash_as_members():
+    value = string_enum(EnumerationEnum9)("lower-layer-down")
+    assert value == DOWN and hash(value) == hash(DOWN)
+    assert {DOWN: 1}.get(value) == 1
+    assert {value: 1}.get(DOWN) == 1
+    assert pickle.loads(pickle.dumps(value)) is value
+
+
+def test_reconcile_and_query_compact_models():
+    document = _document()
+    expected = Model.model_validate(document)
+    model = compact(Model).model_validate(document)
+    table, reference = Reconciliation(model), Reconciliation(expected)
+    assert np.array_equal(table.oper_status, reference.oper_status)
+    assert table.enabled_not_up() == reference.enabled_not_up()
+
+    path = "/interfaces-state/interface[oper-status='lower-layer-down']"
+    names = [entry.name for entry in select(expected, path)]
+    assert len(names) == 1
+    assert [entry.name for entry in select(model, path)] == names
+    assert [entry.name for entry in QueryEngine(model).select(path)] == names
@@ -0,0 +1,44 @@
+import warnings
+
+import pytest
+
+from models import synthetic
+from models.defaults import EMPTY, share_defaults
+from models.ietf_interface import InterfaceListEntry, Model
+
+
+def test_json_schema_keeps_the_empty_list_defaults():
+    schemas = [Model.model_json_schema(by_alias=True)]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        share_defaults()
+        schemas.append(Model.model_json_schema(by_alias=True))
+    assert schemas[0] == schemas[1]
+    fields = schemas[1]["$defs"]["InterfaceListEntry"]["properties"]
+    assert fields["ietf-interfaces:higher-layer-if"]["default"] == []
+
+
+def test_shared_default_is_read_only():
+    share_defaults()
+    entry = InterfaceListEntry.model_validate(
+        {
+            "ietf-interfaces:name": "eth0",
+            "ietf-interfaces:type": "iana-if-type:ethernetCsmacd",
+            "ietf-interfaces:admin-status": "up",
+            "ietf-interfaces:oper-status": "up",
+            "ietf-interfaces:if-index": 1,
+        }
+    )
+    assert entry.higher_layer_if is EMPTY and entry.higher_layer_if == []
+    with pytest.raises(TypeError):
+        entry.higher_layer_if.append("eth1")
+    entry.higher_layer_if += ["eth1"]
+    assert entry.higher_layer_if == ["eth1"] and EMPTY == []
+
+
+def test_dumps_are_unchanged():
+    document = synthetic.payload(5)
+    before = Model.model_validate(document).model_dump_json(exclude_defaults=True)
+    share_defaults()
+    after = Model.model_validate(document).model_dump_json(exclude_defaults=True)
+    assert before == after
@@ -0,0 +1,49 @@
+import hashlib
+import json
+import subprocess
+import sys
+
+from models import descriptions
+from models.descriptions import GENERATED, description, store_path
+from models.ietf_interface import InterfaceListEntry2, Model
+
+
+def test_store_matches_the_generated_source():
+    with open(sys.modules[GENERATED].__file__, "rb") as file:
+        source = file.read()
+    with open(store_path(), encoding="utf-8") as file:
+        store = json.load(file)
+    assert store["source"] == hashlib.sha256(source).hexdigest()
+    assert store["descriptions"] == descriptions._parse(source, GENERATED)
+
+
+def test_description():
+    assert description(InterfaceListEntry2, "oper_status").startswith(
+        "The current operational state of the interface."
+    )
+    assert description(InterfaceListEntry2).startswith(
+        "The list of interfaces on the device.\n\n"
+    )
+    assert description(InterfaceListEntry2, "no_such_leaf") is None
+
+
+def test_restore_without_docstrings():
+    script = (
+        "import json\n"
+        "from models import descriptions\n"
+        "from models.ietf_interface import InterfaceListEntry2, Model\n"
+        "stripped = InterfaceListEntry2.__doc__\n"
+        "descriptions.restore()\n"
+        "print(json.dumps([stripped, InterfaceListEntry2.__doc__,"
+        " Model.model_json_schema(by_alias=True)]))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-OO", "-c", script],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    stripped, restored, schema = json.loads(output)
+    assert stripped is None
+    assert restored == InterfaceListEntry2.__doc__
+    assert schema == Model.model_json_schema(by_alias=True)
@@ -0,0 +1,42 @@
+from models import synthetic
+from models.history import StatusHistory
+from models.ietf_interface import EnumerationEnum9, InterfacesStateContainer
+from models.yang_types import DateAndTime
+
+T0 = 1_710_000_000 * 10**9
+INTERVAL = 10 * 10**9
+
+
+def _state() -> InterfacesStateContainer:
+    return InterfacesStateContainer.model_validate(synthetic.state_payload(3))
+
+
+def test_impossible_last_change_starts_at_the_poll():
+    state = _state()
+    history = StatusHistory()
+    history.poll(state, T0)
+    bad, good = state.interface[0], state.interface[1]
+    bad.oper_status = good.oper_status = EnumerationEnum9.testing
+    # Matches the pattern of the generated model, but February has no 30th.
+    bad.last_change = "2024-02-30T12:00:00Z"
+    good.last_change = "2024-03-09T16:00:05Z"
+
+    assert history.poll(state, T0 + INTERVAL) == 2
+    assert history.runs(bad.name)[-1].start == T0 + INTERVAL
+    assert history.runs(good.name)[-1].start == DateAndTime(good.last_change).epoch_ns
+
+    # Nothing changed since: no new runs, no flaps.
+    assert history.poll(state, T0 + 2 * INTERVAL) == 0
+    assert len(history.runs(bad.name)) == 2
+    assert history.flaps(bad.name, T0, T0 + 2 * INTERVAL) == 0
+
+
+def test_bounce_between_polls_is_a_flap():
+    state = _state()
+    history = StatusHistory()
+    entry = state.interface[2]
+    entry.oper_status = EnumerationEnum9.up
+    history.poll(state, T0)
+    entry.last_change = "2024-03-09T16:00:05Z"
+    assert history.poll(state, T0 + INTERVAL) == 1
+    assert history.flaps(entry.name, T0, T0 + INTERVAL) == 1
@@ -0,0 +1,23 @@
+import gc
+
+from models import synthetic
+from models.merkle import Difference, MerkleTree
+
+
+def test_update_matches_a_fresh_tree():
+    old, model = synthetic.model(50), synthetic.model(50)
+    tree = MerkleTree(model)
+    state = model.interfaces_state.interface
+    # Replaced entries are freed: their ids may be reused by new nodes.
+    for position in range(0, 50, 5):
+        state[position] = state[position].model_copy(deep=True)
+    tree.update(model.interfaces_state)
+    gc.collect()
+    for entry in state[::5]:
+        entry.speed = 1
+        tree.update(entry)
+    assert tree.digest == MerkleTree(model).digest
+    assert sorted(tree.diff(MerkleTree(old))) == sorted(
+        Difference(f"/interfaces-state/interface={entry.name}/speed", "changed")
+        for entry in state[::5]
+    )
@@ -0,0 +1,43 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pydantic import ValidationError
+
+from models import parallel, synthetic
+from models.ietf_interface import Model
+
+
+def _errors(validate, data):
+    with pytest.raises(ValidationError) as raised:
+        validate(data)
+    return raised.value.errors(include_url=False)
+
+
+def test_errors_are_those_of_serial_validation():
+    # The config list is long enough to be split; the state list is not.
+    document = synthetic.payload(parallel.MIN_ENTRIES)
+    config = document["ietf-interfaces:interfaces"]["ietf-interfaces:interface"]
+    config[-1]["ietf-interfaces:name"] = 5
+    state = document["ietf-interfaces:interfaces-state"]["ietf-interfaces:interface"]
+    del state[10:]
+    state[0]["ietf-interfaces:if-index"] = 0
+    data = json.dumps(document).encode()
+
+    serial = _errors(Model.model_validate_json, data)
+    assert [e["loc"][0] for e in serial] == [
+        "ietf-interfaces:interfaces",
+        "ietf-interfaces:interfaces-state",
+    ]
+    with ThreadPoolExecutor(2) as executor:
+        errors = _errors(
+            lambda d: parallel.validate_json(d, 2, executor=executor), data
+        )
+    assert errors == serial
+
+
+def test_valid_document():
+    data = json.dumps(synthetic.payload(parallel.MIN_ENTRIES)).encode()
+    with ThreadPoolExecutor(2) as executor:
+        model = parallel.validate_json(data, 2, executor=executor)
+    assert model == Model.model_validate_json(data)
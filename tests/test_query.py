@@ -0,0 +1,43 @@
+import pytest
+
+from models import synthetic
+from models.query import QueryEngine, QuerySyntaxError, select
+
+STATE = "/interfaces-state/interface"
+
+
+@pytest.fixture(scope="module")
+def model():
+    model = synthetic.model(20)
+    model.interfaces_state.interface[3].speed = 1_000_000_000
+    return model
+
+
+def _indexes(model, path):
+    scanned = [entry.if_index for entry in select(model, path)]
+    assert [entry.if_index for entry in QueryEngine(model).select(path)] == scanned
+    return scanned
+
+
+@pytest.mark.parametrize("literal", ["5", "'5'", '"5"', "5.0", "'5e0'"])
+def test_numbers_compare_as_numbers_with_every_operator(model, literal):
+    assert _indexes(model, f"{STATE}[if-index={literal}]") == [5]
+    assert len(_indexes(model, f"{STATE}[if-index!={literal}]")) == 19
+    assert _indexes(model, f"{STATE}[if-index<{literal}]") == [1, 2, 3, 4]
+    assert _indexes(model, f"{STATE}[if-index>={literal}][if-index<=6]") == [5, 6]
+
+
+def test_exponents(model):
+    assert len(_indexes(model, f"{STATE}[speed>1e9]")) == 19
+    assert _indexes(model, f"{STATE}[speed=1E+9]") == [4]
+    assert _indexes(model, f"{STATE}[speed<1.5e9]") == [4]
+    assert _indexes(model, f"{STATE}[if-index<2.5]") == [1, 2]
+
+
+def test_strings_compare_as_strings(model):
+    assert _indexes(model, f"{STATE}[name='eth5']") == [8]
+    assert _indexes(model, f"{STATE}[if-index='five']") == []
+    assert len(_indexes(model, f"{STATE}[if-index!='five']")) == 20
+    assert _indexes(model, f"{STATE}[name=5]") == []
+    with pytest.raises(QuerySyntaxError):
+        select(model, f"{STATE}[if-index<'five']")
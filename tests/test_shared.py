@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+OWNER = """
+import os, subprocess, sys
+from models import synthetic
+from models.shared import SharedState
+state = synthetic.model(3).interfaces_state
+with SharedState.create(state) as store:
+    # A reader that crashes without closing leaves the segment alone.
+    reader = (
+        "import os; from models.shared import SharedState; "
+        f"reader = SharedState.attach({store.name!r}); "
+        "print(len(reader), flush=True); os._exit(0)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", reader], capture_output=True, text=True, check=True
+    )
+    assert output.stdout == "3\\n" and output.stderr == "", output
+    print(store.name, flush=True)
+    if sys.argv[1:] == ["crash"]:
+        os._exit(0)
+    with SharedState.attach(store.name) as reader:
+        assert reader[2] == state.interface[2]
+"""
+
+
+def _owner(*args):
+    return subprocess.run(
+        [sys.executable, "-c", OWNER, *args], capture_output=True, text=True, check=True
+    )
+
+
+def test_owner_unlinks():
+    owner = _owner()
+    assert owner.stderr == ""
+    if os.path.isdir("/dev/shm"):
+        assert not os.path.exists(f"/dev/shm/{owner.stdout.strip()}")
+
+
+def test_crashed_owner_leaks_the_segment():
+    from models.shared import SharedState
+
+    owner = _owner("crash")
+    assert owner.stderr == ""
+    # Nobody unlinked it: another process can still attach, and remove it.
+    with SharedState.attach(owner.stdout.strip()) as store:
+        assert len(store) == 3
+        store.unlink()
@@ -0,0 +1,27 @@
+import pytest
+from pydantic import ValidationError
+
+from models.ietf_interface import InterfacesContainer, Model
+from models.integrity import check_integrity
+from models.templates import InterfaceTemplate
+
+
+def test_duplicates_are_reported_like_integrity_violations():
+    template = InterfaceTemplate(
+        type="iana-if-type:ethernetCsmacd", admin_status="up", oper_status="down"
+    )
+    names, if_index = ["eth1", "eth2", "eth1", "eth1"], [3, 3, 4, 3]
+    with pytest.raises(ValidationError) as raised:
+        template.expand(names, if_index=if_index)
+    errors = raised.value.errors(include_url=False)
+
+    entries = [
+        template.expand([name], if_index=[index])[0]
+        for name, index in zip(names, if_index)
+    ]
+    model = Model(interfaces=InterfacesContainer(interface=entries))
+    violations = check_integrity(model)
+    assert [(e["type"], e["loc"], e["input"], e["msg"]) for e in errors] == [
+        (v.type, v.loc, v.value, v.message) for v in violations
+    ]
+    assert errors[0]["ctx"] == {"value": "eth1", "first": 0}
@@ -0,0 +1,21 @@
+import json
+
+from models import synthetic, tracing
+from models.ietf_interface import Model
+
+
+def test_one_span_per_call_written_on_exit(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    document = json.dumps(synthetic.payload(3))
+    with tracing.FileExporter(str(path), buffer=2) as exporter:
+        tracing.instrument(tracing.Tracer(exporter))
+        try:
+            for _ in range(3):
+                Model.model_validate_json(document)
+        finally:
+            tracing.uninstrument()
+        assert len(path.read_text().splitlines()) == 2
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    # Subtrees are validated inside the document's call, without spans.
+    assert [record["name"] for record in records] == 3 * ["Model.model_validate_json"]
+    assert {record["attributes"]["interface.count"] for record in records} == {6}